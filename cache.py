@@ -0,0 +1,160 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Cache de resultados endereçado pelo conteúdo das entradas (memória LRU + disco opcional)
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _canonico(valor, partes):
+    # Acrescenta a partes bytes que só dependem do conteúdo: 2 e 2.0 são iguais, a
+    # ordem das chaves de um dict não importa e objetos entram pelos seus atributos
+    tipo = type(valor)
+    if tipo is float or tipo is int:
+        partes.append(b"n" + struct.pack("<d", valor))
+    elif tipo is np.ndarray and (valor.ndim > 0 or valor.dtype.kind not in "biuf"):
+        # Arrays numéricos em float64, como os escalares: [2, 3] e [2.0, 3.0] são iguais
+        if valor.dtype.kind in "iuf":
+            valor = valor.astype(np.float64, copy=False)
+        partes.append(f"a{valor.dtype.str}{valor.shape}:".encode())
+        partes.append(valor.tobytes())
+    elif valor is None or isinstance(valor, (bool, np.bool_)):
+        partes.append(f"<{valor!r}>".encode())
+    elif isinstance(valor, (int, float, np.integer, np.floating, np.ndarray)):
+        partes.append(b"n" + struct.pack("<d", float(valor)))
+    elif isinstance(valor, str):
+        partes.append(f"s{len(valor)}:".encode() + valor.encode())
+    elif isinstance(valor, (list, tuple)):
+        partes.append(f"l{len(valor)}[".encode())
+        for item in valor:
+            _canonico(item, partes)
+        partes.append(b"]")
+    elif isinstance(valor, dict):
+        partes.append(f"d{len(valor)}{{".encode())
+        for k in sorted(valor, key=str):
+            _canonico(str(k), partes)
+            _canonico(valor[k], partes)
+        partes.append(b"}")
+    elif callable(valor) and hasattr(valor, "__qualname__"):
+        # Funções pelo nome completo. Lambdas e funções locais não têm nome único (nem o
+        # mesmo estado capturado), então não geram chave; métodos incluem o objeto.
+        if "<" in valor.__qualname__:
+            raise TypeError(f"Não é possível gerar a chave de {valor.__qualname__}")
+        partes.append(f"f{valor.__module__}.{valor.__qualname__};".encode())
+        dono = getattr(valor, "__self__", None)
+        if dono is not None and not isinstance(dono, types.ModuleType):
+            _canonico(dono, partes)
+    elif hasattr(valor, "__dict__"):
+        partes.append(f"o{tipo.__module__}.{tipo.__qualname__}".encode())
+        _canonico(vars(valor), partes)
+    else:
+        raise TypeError(f"Não é possível gerar a chave de {tipo.__name__}")
+
+
+def chave(*partes):
+    bytes_ = []
+    _canonico(partes, bytes_)
+    return hashlib.blake2b(b"".join(bytes_), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    # LRU em memória com até maximo resultados e, com pasta, uma camada em disco (um
+    # pickle por chave) que sobrevive entre execuções. A chave inclui a função, os
+    # argumentos e o sistema de unidades, para que SI e inglês nunca colidam.
+    def __init__(self, maximo=256, pasta=None) -> None:
+        self.maximo = maximo
+        self.pasta = pasta
+        self.memoria = OrderedDict()
+        self.trava = threading.Lock()
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+
+    def __call__(self, funcao, *args, unidades=None, extras=None, **kwargs):
+        # extras: argumentos passados à função que não mudam o resultado (ex.: cancelar).
+        # Resultados None (cálculo cancelado) não são guardados.
+        k = chave(funcao, unidades, args, kwargs)
+        encontrado, valor = self.obter(k)
+        if encontrado:
+            return valor
+
+        valor = funcao(*args, **kwargs, **(extras or {}))
+        if valor is not None:
+            self.guardar(k, valor)
+        return valor
+
+    def _arquivo(self, k):
+        return os.path.join(self.pasta, f"{k}.pkl")
+
+    def obter(self, k):
+        with self.trava:
+            if k in self.memoria:
+                self.memoria.move_to_end(k)
+                self.acertos += 1
+                return True, self.memoria[k]
+
+        if self.pasta is not None:
+            try:
+                with open(self._arquivo(k), "rb") as arquivo:
+                    valor = pickle.load(arquivo)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+            else:
+                with self.trava:
+                    self.acertos += 1
+                    self.acertos_disco += 1
+                self._memorizar(k, valor)
+                return True, valor
+
+        with self.trava:
+            self.falhas += 1
+        return False, None
+
+    def guardar(self, k, valor):
+        self._memorizar(k, valor)
+        if self.pasta is not None:
+            # Escrita atômica: outro processo nunca lê um arquivo pela metade
+            os.makedirs(self.pasta, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=self.pasta, suffix=".tmp")
+            with os.fdopen(descritor, "wb") as arquivo:
+                pickle.dump(valor, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, self._arquivo(k))
+
+    def _memorizar(self, k, valor):
+        with self.trava:
+            self.memoria[k] = valor
+            self.memoria.move_to_end(k)
+            while len(self.memoria) > self.maximo:
+                self.memoria.popitem(last=False)
+
+    def estatisticas(self):
+        with self.trava:
+            return {
+                "acertos": self.acertos,
+                "acertos_disco": self.acertos_disco,
+                "falhas": self.falhas,
+                "itens": len(self.memoria),
+            }
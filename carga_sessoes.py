@@ -0,0 +1,187 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Teste de carga: várias sessões simultâneas da interface, sem servidor Flet
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+# Uso: python carga_sessoes.py [N1 N2 ...]  (padrão: 1 10 50 100 sessões)
+# Cada sessão roda em uma thread, como os eventos do Flet no modo web, e as etapas
+# são sincronizadas por uma barreira para que as sessões se intercalem ao máximo.
+# Verifica se cada sessão mostra os resultados do seu próprio eixo e mede o tempo dos
+# cliques (que disparam a análise estática) no relógio e em CPU da thread.
+
+import sys
+import threading
+from time import perf_counter, thread_time
+
+import flet
+import numpy as np
+
+import main as app
+from estatica import ShaftModel, solve_statics
+
+
+# Sem conexão com um cliente, update() de um controle não tem para onde enviar nada
+flet.Control.update = lambda self: None
+
+
+class PaginaSimulada:
+    def __init__(self) -> None:
+        self.height = 800
+        self.width = 1200
+        self.controls = []
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+
+    def update(self, *controles):
+        pass
+
+    def run_thread(self, funcao, *args, **kwargs):
+        funcao(*args, **kwargs)
+
+
+class Evento:
+    def __init__(self, control) -> None:
+        self.control = control
+        self.data = None
+
+
+def controles(raiz):
+    # Todos os controles da árvore (inclusive abas ainda não selecionadas)
+    vistos, pilha, todos = set(), [raiz], []
+    while pilha:
+        c = pilha.pop()
+        if c is None or id(c) in vistos:
+            continue
+        vistos.add(id(c))
+        todos.append(c)
+        for atributo in ("controls", "content", "tabs"):
+            filho = getattr(c, atributo, None)
+            if isinstance(filho, list):
+                pilha.extend(filho)
+            elif isinstance(filho, flet.Control):
+                pilha.append(filho)
+    return todos
+
+
+class Sessao:
+    def __init__(self, semente) -> None:
+        rng = np.random.default_rng(semente)
+        self.comp_eixo = round(float(rng.uniform(5, 20)), 2)
+        self.apoios = (round(0.05 * self.comp_eixo, 2), round(0.95 * self.comp_eixo, 2))
+        self.forcas = [
+            (round(float(rng.uniform(-1000, 1000)), 1), round(float(rng.uniform(-1000, 1000)), 1),
+             round(float(rng.uniform(0, self.comp_eixo)), 2), round(float(rng.uniform(0, 5)), 2), 0.0)
+            for _ in range(int(rng.integers(1, 5)))
+        ]
+        self.pagina = PaginaSimulada()
+        self.tempos = []
+
+    def campo(self, rotulo, valor):
+        c = next(c for c in controles(self.pagina.controls[0]) if getattr(c, "label", None) == rotulo)
+        c.value = str(valor)
+        if c.on_blur is not None:
+            c.on_blur(Evento(c))
+
+    def clicar(self, predicado):
+        c = next(c for c in controles(self.pagina.controls[0]) if predicado(c))
+        inicio, cpu = perf_counter(), thread_time()
+        c.on_click(Evento(c))
+        self.tempos.append((perf_counter() - inicio, thread_time() - cpu))
+
+    def esperado(self):
+        f = np.array([(0.0, fy, fz) for fy, fz, *_ in self.forcas])
+        r = np.array([(rx, ry, rz) for _, _, rx, ry, rz in self.forcas])
+        resultado = solve_statics(ShaftModel(self.comp_eixo, self.apoios, f, r))
+        return {f"{resultado.Mh_max:.2f} N·m", f"{resultado.Mv_max:.2f} N·m"}
+
+    def mostrado(self):
+        return {c.value for c in controles(self.pagina.controls[0]) if isinstance(c, flet.Text) and c.value}
+
+
+def rodar(n):
+    sessoes = [Sessao(semente) for semente in range(n)]
+    barreira = threading.Barrier(n)
+    erros = []
+
+    def etapas(s: Sessao):
+        try:
+            app.main(s.pagina)
+            barreira.wait()
+            s.campo("Comprimento do Eixo", s.comp_eixo)
+            s.campo("Quantidade de Forças", len(s.forcas))
+            s.campo("Posição do apoio 1", s.apoios[0])
+            s.campo("Posição do apoio 2", s.apoios[1])
+            barreira.wait()
+            s.clicar(lambda c: isinstance(c, flet.FilledButton) and c.text == "Adicionar Dados")
+            for fy, fz, rx, ry, rz in s.forcas:
+                barreira.wait()
+                for rotulo, valor in (("Fy", fy), ("Fz", fz), ("rx", rx), ("ry", ry), ("rz", rz)):
+                    s.campo(rotulo, valor)
+                s.clicar(lambda c: isinstance(c, flet.IconButton) and c.tooltip == "Adicionar Força")
+        except threading.BrokenBarrierError:
+            pass
+        except Exception as erro:
+            erros.append(erro)
+            barreira.abort()
+
+    # Sessões com menos forças também esperam nas barreiras das demais
+    maximo = max(len(s.forcas) for s in sessoes)
+    threads = []
+    for s in sessoes:
+        def alvo(s=s):
+            etapas(s)
+            for _ in range(maximo - len(s.forcas)):
+                try:
+                    barreira.wait()
+                except threading.BrokenBarrierError:
+                    break
+        threads.append(threading.Thread(target=alvo))
+
+    inicio = perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = perf_counter() - inicio
+
+    if erros:
+        raise erros[0]
+
+    isoladas = sum(s.esperado() <= s.mostrado() for s in sessoes)
+    relogio = np.array([t for s in sessoes for t, _ in s.tempos])
+    cpu = np.array([c for s in sessoes for _, c in s.tempos])
+    return isoladas, total, relogio, cpu
+
+
+if __name__ == "__main__":
+    niveis = [int(n) for n in sys.argv[1:]] or [1, 10, 50, 100]
+    print(f"{'sessões':>8} {'corretas':>9} {'total (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'CPU p95 (ms)':>13}")
+    falhou = False
+    referencia = None
+    for n in niveis:
+        isoladas, total, relogio, cpu = rodar(n)
+        p95_cpu = 1000 * np.percentile(cpu, 95)
+        referencia = referencia or p95_cpu
+        print(
+            f"{n:>8} {isoladas:>6}/{n:<3}{total:>10.2f} {1000 * np.median(relogio):>9.2f} "
+            f"{1000 * np.percentile(relogio, 95):>9.2f} {p95_cpu:>13.2f}"
+        )
+        # O custo de cada clique não pode crescer com o número de sessões (1 ms de folga
+        # para o ruído de medição em tempos tão curtos)
+        falhou = falhou or isoladas != n or p95_cpu > 2 * referencia + 1.0
+    sys.exit(1 if falhou else 0)
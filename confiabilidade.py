@@ -0,0 +1,152 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Confiabilidade por Monte Carlo: probabilidade de falha e percentis do CS
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+
+from fadiga import FatigueModel, coeficiente_seguranca
+
+
+PARAMETROS = {
+    # Grandezas que podem ser constantes ou distribuições, com o valor padrão.
+    # Sut e Sy são obrigatórios; sem "Se_linha" usa-se Se' = 0.5 * Sut
+    "Kff": 1.0, "Kfs": 1.0,
+    "Ma": 0.0, "Mm": 0.0, "Ta": 0.0, "Tm": 0.0, "Mmax": 0.0, "Tmax": 0.0,
+    "ka": 1.0, "kb": 1.0, "kc": 1.0, "kd": 1.0, "ke": 1.0,
+}
+
+PERCENTIS = (0.1, 1.0, 5.0, 50.0, 95.0, 99.0)
+
+# Histograma de log10(CS) usado para os percentis com memória constante
+LOG_CS_MIN, LOG_CS_MAX, CLASSES = -3.0, 3.0, 6000
+
+
+class Normal:
+    def __init__(self, media, desvio) -> None:
+        self.media = float(media)
+        self.desvio = float(desvio)
+
+    def amostrar(self, rng, n):
+        return rng.normal(self.media, self.desvio, n)
+
+
+class LogNormal:
+    # Parametrizada pela média e desvio padrão da própria variável (não do log)
+    def __init__(self, media, desvio) -> None:
+        self.media = float(media)
+        self.desvio = float(desvio)
+        cv2 = (self.desvio / self.media) ** 2
+        self._sigma = np.sqrt(np.log1p(cv2))
+        self._mu = np.log(self.media) - self._sigma**2 / 2
+
+    def amostrar(self, rng, n):
+        return rng.lognormal(self._mu, self._sigma, n)
+
+
+class Uniform:
+    def __init__(self, minimo, maximo) -> None:
+        self.minimo = float(minimo)
+        self.maximo = float(maximo)
+
+    def amostrar(self, rng, n):
+        return rng.uniform(self.minimo, self.maximo, n)
+
+
+class ReliabilityResult:
+    def __init__(self, n, falhas, contagem, finitos, soma, soma2) -> None:
+        self.n = n
+        self.falhas = falhas
+        self.pf = falhas / n
+        self.confiabilidade = 1.0 - self.pf
+        self.media = soma / finitos if finitos else np.inf
+        self.desvio = np.sqrt(max(soma2 / finitos - self.media**2, 0.0)) if finitos else 0.0
+        self.percentis = {p: _percentil(contagem, n, p) for p in PERCENTIS}
+
+
+def _percentil(contagem, n, p):
+    # contagem tem uma classe extra em cada ponta (abaixo/acima da faixa)
+    bordas = np.linspace(LOG_CS_MIN, LOG_CS_MAX, CLASSES + 1)
+    acumulado = np.cumsum(contagem)
+    alvo = p / 100 * n
+    k = int(np.searchsorted(acumulado, alvo, side="left"))
+    if k == 0:
+        return 10**LOG_CS_MIN
+    if k > CLASSES:
+        return np.inf
+    # Interpolação linear (em log) dentro da classe k, que vai de bordas[k - 1] a bordas[k]
+    antes = acumulado[k] - contagem[k]
+    t = (alvo - antes) / contagem[k] if contagem[k] > 0 else 0.0
+    return float(10 ** (bordas[k - 1] + t * (bordas[k] - bordas[k - 1])))
+
+
+def _amostrar(valor, rng, n):
+    if hasattr(valor, "amostrar"):
+        return valor.amostrar(rng, n)
+    return np.full(n, float(valor))
+
+
+def _bloco(criterio, d, parametros, rng, n):
+    amostras = {nome: _amostrar(parametros.get(nome, padrao), rng, n) for nome, padrao in PARAMETROS.items()}
+    amostras["Sut"] = _amostrar(parametros["Sut"], rng, n)
+    amostras["Sy"] = _amostrar(parametros["Sy"], rng, n)
+    if "Se_linha" in parametros:
+        Se_linha = _amostrar(parametros["Se_linha"], rng, n)
+    else:
+        Se_linha = 0.5 * amostras["Sut"]
+
+    Se = Se_linha * amostras["ka"] * amostras["kb"] * amostras["kc"] * amostras["kd"] * amostras["ke"]
+    m = FatigueModel(
+        amostras["Kff"], amostras["Kfs"], amostras["Ma"], amostras["Mm"],
+        amostras["Ta"], amostras["Tm"], amostras["Mmax"], amostras["Tmax"],
+        Se=Se, Sut=amostras["Sut"], Sy=amostras["Sy"],
+    )
+    return coeficiente_seguranca(criterio, d, m)
+
+
+def monte_carlo(criterio, d, parametros, n_amostras=1_000_000, bloco=100_000, semente=0, cancelar=None):
+    # Amostra em blocos de tamanho fixo: a memória não depende de n_amostras.
+    # Cada bloco tem sua própria semente (SeedSequence.spawn), então o resultado
+    # é reprodutível e não depende da ordem em que os blocos são processados.
+    # As sementes são geradas uma a uma, conforme os blocos avançam: spawn(1)
+    # repetido dá os mesmos filhos que spawn(n_blocos) de uma vez.
+    # cancelar é um objeto com is_set(), verificado entre os blocos; se cancelado
+    # retorna None.
+    n_blocos = -(-n_amostras // bloco)
+    sequencia = np.random.SeedSequence(semente)
+
+    contagem = np.zeros(CLASSES + 2, dtype=np.int64)
+    falhas, finitos, soma, soma2 = 0, 0, 0.0, 0.0
+    for i in range(n_blocos):
+        if cancelar is not None and cancelar.is_set():
+            return None
+        n = min(bloco, n_amostras - i * bloco)
+        rng = np.random.default_rng(sequencia.spawn(1)[0])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cs = _bloco(criterio, d, parametros, rng, n)
+
+        falhas += int(np.count_nonzero(~(cs >= 1.0)))
+        validos = cs[np.isfinite(cs)]
+        finitos += validos.size
+        soma += float(np.sum(validos))
+        soma2 += float(np.sum(validos**2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            classe = np.floor((np.log10(cs) - LOG_CS_MIN) * CLASSES / (LOG_CS_MAX - LOG_CS_MIN))
+        classe = np.clip(np.nan_to_num(classe, nan=-1, posinf=CLASSES, neginf=-1), -1, CLASSES) + 1
+        contagem += np.bincount(classe.astype(np.int64), minlength=CLASSES + 2)
+
+    return ReliabilityResult(n_amostras, falhas, contagem, finitos, soma, soma2)
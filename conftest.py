@@ -0,0 +1,21 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Configuração do pytest
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+# Os testes importam os módulos da raiz do repositório (estatica, fadiga, lote, ...):
+# este arquivo faz o pytest colocar a raiz no sys.path
@@ -0,0 +1,136 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Dano acumulado por um espectro de cargas: curva S-N e regra de Palmgren-Miner
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import csv
+
+import numpy as np
+
+from fadiga import PI, FatigueModel, _termos
+
+
+# Tensão de 1 ksi nas unidades de cada sistema (Pa ou psi), pela unidade de comprimento
+KSI = {"m": 6.894757e6, "in": 1e3}
+
+# Tensão alternada equivalente totalmente reversa: sa / g(sm), com g por critério
+CORRECAO_MEDIA = {
+    "Goodman": lambda sm, m: 1 - sm / m.Sut,
+    "Gerber": lambda sm, m: 1 - (sm / m.Sut) ** 2,
+    "Soderberg": lambda sm, m: 1 - sm / m.Sy,
+    "ASME Elíptico": lambda sm, m: np.sqrt(np.maximum(1 - (sm / m.Sy) ** 2, 0.0)),
+}
+
+
+class DutyCycle:
+    # Níveis do espectro: esforços de cada nível e o número de ciclos em cada
+    # repetição do ciclo de trabalho (todos arrays com a mesma forma)
+    def __init__(self, Ma=0.0, Mm=0.0, Ta=0.0, Tm=0.0, ciclos=1.0) -> None:
+        self.Ma, self.Mm, self.Ta, self.Tm, self.ciclos = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (Ma, Mm, Ta, Tm, ciclos))
+        )
+        if np.any(self.ciclos < 0):
+            raise ValueError("O número de ciclos não pode ser negativo")
+
+
+class SNCurve:
+    # Sf = a * N**b entre 10**3 e Ne ciclos; abaixo de Se a vida é infinita. Sem f,
+    # usa a fração de Sut em 10**3 ciclos do ajuste de Shigley (Sut em ksi, 70 a 200).
+    # Acima de f * Sut vale a reta de baixo ciclo de Shigley, de Sut em 1 ciclo a
+    # f * Sut em 10**3; a partir de Sut a falha é no primeiro ciclo (0).
+    def __init__(self, Sut, Se, f=None, Ne=1e6, ksi=KSI["m"]) -> None:
+        self.Sut = np.asarray(Sut, dtype=float)
+        self.Se = np.asarray(Se, dtype=float)
+        if f is None:
+            s = np.clip(self.Sut / ksi, 70.0, 200.0)
+            f = 1.06 - 2.8e-3 * s + 6.9e-6 * s**2
+        self.f = np.asarray(f, dtype=float)
+        # Com Se >= f * Sut o expoente b seria positivo e a vida cresceria com a tensão
+        if np.any(self.f * self.Sut <= self.Se):
+            raise ValueError("O limite de fadiga Se deve ser menor que f * Sut")
+        self.b = -np.log10(self.f * self.Sut / self.Se) / np.log10(Ne / 1e3)
+        self.a = self.f * self.Sut / 1e3**self.b
+
+    def ciclos(self, S):
+        # Ciclos até a falha para a tensão totalmente reversa S (inf para S infinito -> 0)
+        S = np.asarray(S, dtype=float)
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            alto = (S / self.a) ** (1 / self.b)
+            baixo = 1e3 ** (np.log10(S / self.Sut) / np.log10(self.f))
+            N = np.where(S < self.f * self.Sut, alto, baixo)
+            return np.where(S <= self.Se, np.inf, np.where(S >= self.Sut, 0.0, N))
+
+
+class DamageResult:
+    def __init__(self, curva: SNCurve, S, N, dano) -> None:
+        self.curva = curva
+        self.S = S
+        self.N = N
+        self.dano = dano
+        self.D = float(np.sum(dano))
+        # Repetições do ciclo de trabalho até D = 1
+        self.vida = 1.0 / self.D if self.D > 0 else np.inf
+        self.critico = int(np.argmax(dano))
+
+
+def dano_miner(d, m: FatigueModel, ciclo: DutyCycle, criterio="Goodman", f=None, Ne=1e6, ksi=KSI["m"]) -> DamageResult:
+    # Kff, Kfs, Se (com os fatores de Marin e kb), Sut e Sy vêm de m; os esforços de
+    # cada nível vêm de ciclo. Tensões de von Mises alternada e média de cada nível,
+    # corrigidas pelo critério para uma tensão totalmente reversa, e D = soma(n / N).
+    if criterio not in CORRECAO_MEDIA:
+        raise ValueError(f"O critério {criterio} não se aplica ao dano por fadiga")
+    niveis = FatigueModel(m.Kff, m.Kfs, ciclo.Ma, ciclo.Mm, ciclo.Ta, ciclo.Tm, Se=m.Se, Sut=m.Sut, Sy=m.Sy, kb=m.kb)
+    A, B, _, _ = _termos(niveis)
+    sa = 16 * A / (PI * d**3)
+    sm = 16 * B / (PI * d**3)
+
+    curva = SNCurve(m.Sut, m.limite_fadiga(d), f, Ne, ksi)
+    # Tensão média além do limite do critério (g <= 0): falha já no primeiro ciclo
+    g = CORRECAO_MEDIA[criterio](sm, m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        S = np.where(g > 0, sa / g, np.inf)
+    N = curva.ciclos(S)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dano = np.where(ciclo.ciclos > 0, ciclo.ciclos / N, 0.0)
+    return DamageResult(curva, S, N, dano)
+
+
+def ler_espectro(arquivo) -> DutyCycle:
+    # CSV com cabeçalho: Ma, Mm, Ta, Tm (ausentes = 0) e ciclos, ou rpm e horas
+    # (ciclos = rpm * 60 * horas). Aceita "," ou ";" como separador; com ";" a
+    # vírgula decimal também é aceita.
+    texto = arquivo.read()
+    separador = ";" if texto.split("\n", 1)[0].count(";") > texto.split("\n", 1)[0].count(",") else ","
+    if separador == ";":
+        texto = texto.replace(",", ".")
+    leitor = csv.reader(texto.splitlines(), delimiter=separador)
+    cabecalho = [c.strip().lower() for c in next(leitor)]
+    linhas = [linha for linha in leitor if any(c.strip() != "" for c in linha)]
+    if not linhas:
+        raise ValueError("Espectro sem níveis de carga")
+    valores = np.array([[c if c.strip() != "" else "0" for c in linha] for linha in linhas], dtype=float)
+
+    def coluna(nome):
+        return valores[:, cabecalho.index(nome)] if nome in cabecalho else 0.0
+
+    if "ciclos" in cabecalho:
+        ciclos = coluna("ciclos")
+    elif "rpm" in cabecalho and "horas" in cabecalho:
+        ciclos = coluna("rpm") * 60 * coluna("horas")
+    else:
+        raise ValueError("O espectro precisa da coluna ciclos ou das colunas rpm e horas")
+    return DutyCycle(coluna("ma"), coluna("mm"), coluna("ta"), coluna("tm"), ciclos)
@@ -0,0 +1,80 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Redução do número de pontos enviados aos gráficos preservando a forma das curvas
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+
+
+def lttb(x, y, n):
+    # Largest-Triangle-Three-Buckets: índices de n pontos (primeiro e último incluídos).
+    # Em cada balde escolhe o ponto que forma o maior triângulo com o ponto escolhido no
+    # balde anterior e com a média do balde seguinte.
+    total = x.size
+    if n >= total:
+        return np.arange(total)
+    if n < 3:
+        # Sem balde intermediário: só as extremidades (ou a primeira, com n = 1)
+        return np.linspace(0, total - 1, max(n, 0)).astype(int)
+
+    bordas = np.linspace(1, total - 1, n - 1).astype(int)
+    escolhidos = np.empty(n, dtype=int)
+    escolhidos[0], escolhidos[-1] = 0, total - 1
+
+    anterior = 0
+    for k in range(n - 2):
+        inicio, fim = bordas[k], max(bordas[k + 1], bordas[k] + 1)
+        seguinte = slice(fim, bordas[k + 2] if k + 2 < n - 1 else total)
+        xm, ym = np.mean(x[seguinte]), np.mean(y[seguinte])
+
+        xa, ya = x[anterior], y[anterior]
+        area = np.abs((xa - xm) * (y[inicio:fim] - ya) - (xa - x[inicio:fim]) * (ym - ya))
+        anterior = inicio + int(np.argmax(area))
+        escolhidos[k + 1] = anterior
+    return escolhidos
+
+
+def decimar(x, y, orcamento=400, manter=()):
+    # Índices dos pontos a desenhar. Sempre mantém as extremidades, o máximo e o mínimo
+    # exatos, os dois lados de cada descontinuidade (x repetido, como no degrau do
+    # torque), as bordas de trechos não finitos e os índices em manter; o restante do
+    # orçamento é preenchido por LTTB. Se os obrigatórios excederem o orçamento, todos
+    # eles são mantidos mesmo assim.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    total = x.size
+    if total <= orcamento:
+        return np.arange(total)
+
+    finito = np.isfinite(y)
+    y_area = np.where(finito, y, 0.0)
+    degraus = np.flatnonzero(np.diff(x) == 0)
+    lacunas = np.flatnonzero(np.diff(finito))
+
+    obrigatorios = np.unique(np.concatenate((
+        [0, total - 1],
+        [np.argmax(np.where(finito, y, -np.inf)), np.argmin(np.where(finito, y, np.inf))],
+        degraus, degraus + 1,
+        lacunas, lacunas + 1,
+        np.asarray(manter, dtype=int),
+    )).astype(int))
+
+    restante = orcamento - obrigatorios.size
+    if restante <= 0:
+        return obrigatorios
+    # A união pode repetir alguns pontos do LTTB, por isso o total fica <= orçamento
+    return np.union1d(obrigatorios, lttb(x, y_area, restante))
@@ -0,0 +1,67 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Teste de escala: varredura paralela com 1 a N processos
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+# Uso: python escala_paralelo.py [P1 P2 ...]  (padrão: 1, 2, 4, ... até os núcleos da máquina)
+# Mede o tempo de executar_varredura com P processos sobre os mesmos casos de carga e
+# mostra o ganho em relação a um processo e a eficiência (ganho / P). Só informativo: o
+# tempo depende da máquina e da carga dela; a correção está em tests/test_paralelo.py.
+
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from estatica import ShaftModel
+from paralelo import SweepSpec, executar_varredura
+
+
+def casos(n, semente=0):
+    rng = np.random.default_rng(semente)
+    lista = []
+    for _ in range(n):
+        k = int(rng.integers(1, 6))
+        f = np.column_stack((np.zeros(k), rng.uniform(-1000, 1000, k), rng.uniform(-1000, 1000, k)))
+        r = np.column_stack((rng.uniform(0, 10, k), rng.uniform(0, 0.2, k), np.zeros(k)))
+        lista.append(ShaftModel(10.0, (0.5, 9.5), f, r))
+    return lista
+
+
+def medir(spec, processos):
+    inicio = perf_counter()
+    executar_varredura(spec, processos=processos)
+    return perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    nucleos = os.cpu_count() or 1
+    niveis = [int(p) for p in sys.argv[1:]] or [2**k for k in range(nucleos.bit_length()) if 2**k <= nucleos]
+    spec = SweepSpec(
+        casos(2000), np.linspace(0.02, 0.06, 9),
+        [(690e6, 580e6, 300e6), (440e6, 370e6, 190e6), (1000e6, 900e6, 420e6)],
+    )
+
+    referencia = medir(spec, 1)
+    print(f"{nucleos} núcleos, {len(spec.casos)} casos, resultado de forma {spec.forma}")
+    print(f"{'processos':>10} {'tempo (s)':>10} {'ganho':>7} {'eficiência':>11}")
+    for p in niveis:
+        tempo = referencia if p == 1 else medir(spec, p)
+        ganho = referencia / tempo
+        # Acima do número de núcleos não há ganho a esperar
+        print(f"{p:>10} {tempo:>10.2f} {ganho:>7.2f} {ganho / p:>11.2f}")
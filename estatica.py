@@ -0,0 +1,569 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Análise estática de eixos (reações e momentos), sem dependência de interface
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import itertools
+
+import numpy as np
+
+from cache import ResultCache
+
+
+class ShaftModel:
+    # Dados de entrada de um eixo bi-apoiado com cargas concentradas.
+    # f e r são (qt_forces, 3); r[:, 0] é a posição axial absoluta (a partir da origem).
+    def __init__(self, comp_eixo, pos_apoio, f, r) -> None:
+        self.comp_eixo = float(comp_eixo)
+        self.pos_apoio = (float(pos_apoio[0]), float(pos_apoio[1]))
+        self.f = np.array(f, dtype=float).reshape(-1, 3)
+        self.r = np.array(r, dtype=float).reshape(-1, 3)
+
+        if self.f.shape != self.r.shape:
+            raise ValueError("f e r precisam ter o mesmo número de forças")
+        if self.pos_apoio[1] == self.pos_apoio[0]:
+            raise ValueError("Os apoios precisam estar em posições diferentes")
+
+    @property
+    def qt_forces(self):
+        return self.f.shape[0]
+
+
+class Diagrama:
+    # Diagrama linear por partes definido pelos vértices (xk, yk). xk é não decrescente
+    # e pode repetir uma posição para representar um degrau (valor à direita prevalece).
+    def __init__(self, xk, yk) -> None:
+        self.xk = np.asarray(xk, dtype=float)
+        self.yk = np.asarray(yk, dtype=float)
+
+    def __call__(self, x, esquerda=False):
+        # esquerda=True devolve o limite à esquerda nos degraus (onde for True)
+        x = np.clip(np.asarray(x, dtype=float), self.xk[0], self.xk[-1])
+        i = np.where(
+            esquerda,
+            np.searchsorted(self.xk, x, side="left") - 1,
+            np.searchsorted(self.xk, x, side="right") - 1,
+        )
+        i = np.clip(i, 0, self.xk.size - 2)
+        x0, x1 = self.xk[i], self.xk[i + 1]
+        y0, y1 = self.yk[i], self.yk[i + 1]
+        dx = x1 - x0
+        t = np.where(dx > 0, (x - x0) / np.where(dx > 0, dx, 1.0), np.where(esquerda, 0.0, 1.0))
+        return y0 + t * (y1 - y0)
+
+    def maximo(self):
+        # Máximo em valor absoluto e sua posição; em um diagrama linear por partes
+        # o extremo está sempre em um vértice
+        i = int(np.argmax(np.abs(self.yk)))
+        return float(np.abs(self.yk[i])), float(self.xk[i])
+
+
+class StaticsResult:
+    def __init__(self, A, B, Mh: Diagrama, Mv: Diagrama, Mt: Diagrama) -> None:
+        self.A = A
+        self.B = B
+        self.Mh = Mh
+        self.Mv = Mv
+        self.Mt = Mt
+        self.Mh_max, self.x_Mh_max = Mh.maximo()
+        self.Mv_max, self.x_Mv_max = Mv.maximo()
+
+    def estacoes(self, n=1000, extras=()):
+        # Malha uniforme mais os vértices dos diagramas e posições extras (ressaltos).
+        # Vértices e extras aparecem duas vezes (limite à esquerda e à direita), de
+        # modo que os extremos entre dois vértices nunca ficam fora das estações.
+        L = self.Mh.xk[-1]
+        malha = np.linspace(0.0, L, num=n)
+        pontos = np.unique(np.concatenate((self.Mh.xk, self.Mv.xk, self.Mt.xk, np.asarray(extras, dtype=float))))
+        pontos = pontos[(pontos >= 0.0) & (pontos <= L)]
+        malha = np.setdiff1d(malha, pontos)
+
+        x = np.concatenate((malha, pontos, pontos))
+        esquerda = np.concatenate((np.zeros(malha.size + pontos.size, dtype=bool), np.ones(pontos.size, dtype=bool)))
+        ordem = np.lexsort((~esquerda, x))
+        return x[ordem], esquerda[ordem]
+
+    def avaliar(self, x, esquerda=False):
+        return self.Mh(x, esquerda), self.Mv(x, esquerda), self.Mt(x, esquerda)
+
+    def sondar(self, x, esquerda=False):
+        # Mh, Mv, momento resultante e Mt exatos em qualquer posição (escalar ou array),
+        # interpolando nos vértices dos diagramas em vez de numa amostragem fixa
+        Mh, Mv, Mt = self.avaliar(x, esquerda)
+        Mr = np.hypot(Mh, Mv)
+        if np.ndim(x) == 0:
+            return float(Mh), float(Mv), float(Mr), float(Mt)
+        return Mh, Mv, Mr, Mt
+
+
+class BatchResult:
+    def __init__(self, x, A, B, Mh, Mv, Mt) -> None:
+        self.x = x
+        self.A = A
+        self.B = B
+        self.Mh = Mh
+        self.Mv = Mv
+        self.Mt = Mt
+        self.Mh_max = np.max(np.abs(Mh), axis=-1)
+        self.Mv_max = np.max(np.abs(Mv), axis=-1)
+
+
+class EnvelopeResult:
+    # Envoltórias (mínimo e máximo em cada estação x) sobre todas as posições das
+    # cargas móveis, e o pico do momento resultante ao longo do eixo para cada posição
+    def __init__(self, x, posicoes, Mh, Mv, Mr_max, Mt, A, B, Mr_pico) -> None:
+        self.x = x
+        self.posicoes = posicoes
+        self.Mh_min, self.Mh_max = Mh
+        self.Mv_min, self.Mv_max = Mv
+        self.Mr_max = Mr_max
+        self.Mt_min, self.Mt_max = Mt
+        self.A_min, self.A_max = A
+        self.B_min, self.B_max = B
+        self.Mr_pico = Mr_pico
+        i = int(np.argmax(Mr_pico))
+        self.posicao_critica = float(posicoes[i])
+        self.Mr_critico = float(Mr_pico[i])
+
+
+class PhaseSweepResult:
+    # Envoltórias em cada estação x sobre todas as combinações de fases das cargas
+    # rotativas, o pico do momento resultante de cada combinação e as maiores reações
+    # radiais nos apoios. Fases em graus, na ordem das cargas rotativas.
+    def __init__(self, x, angulos, Mh, Mv, Mr_max, Mr_pico, fases_criticas, Ar, fases_A, Br, fases_B) -> None:
+        self.x = x
+        self.angulos = angulos
+        self.Mh_min, self.Mh_max = Mh
+        self.Mv_min, self.Mv_max = Mv
+        self.Mr_max = Mr_max
+        self.Mr_pico = Mr_pico
+        self.Mr_critico = float(np.max(Mr_pico))
+        self.fases_criticas = fases_criticas
+        self.Ar_max, self.fases_A = Ar, fases_A
+        self.Br_max, self.fases_B = Br, fases_B
+
+
+class InfluenceMatrix:
+    # Para uma geometria fixa (comprimento, apoios e posições/braços das forças) Mh, Mv
+    # e Mt são lineares nas componentes das forças. H[j, i] é o momento em x[j] de uma
+    # força unitária em r[i, 0] junto com as reações que ela provoca, e S[j, i] é o
+    # degrau de torque; qualquer combinação de intensidades sai de M = H @ F.
+    def __init__(self, comp_eixo, pos_apoio, r, x=None, n=1000) -> None:
+        self.comp_eixo = float(comp_eixo)
+        a, b = float(pos_apoio[0]), float(pos_apoio[1])
+        self.r = np.array(r, dtype=float).reshape(-1, 3)
+        self.x = np.linspace(0.0, self.comp_eixo, num=n) if x is None else np.asarray(x, dtype=float)
+        d = self.r[:, 0]
+
+        # Reações de uma força unitária (em y ou em z) na posição d
+        self.ra = -(b - d) / (b - a)
+        self.rb = -(d - a) / (b - a)
+
+        def singular(p):
+            return np.maximum(self.x[:, np.newaxis] - p, 0.0)
+
+        self.H = singular(d) + singular(a) * self.ra + singular(b) * self.rb
+        self.S = (self.x[:, np.newaxis] >= d).astype(float)
+
+    def avaliar(self, Fy, Fz):
+        # Fy e Fz com forma (forças,) ou (casos, forças); Mh, Mv e Mt voltam com forma
+        # (estações,) ou (casos, estações). Os dois planos saem de um único GEMM, com os
+        # casos nas linhas (F @ H.T) para não transpor o resultado.
+        Fy = np.asarray(Fy, dtype=float)
+        Fz = np.asarray(Fz, dtype=float)
+        forma = Fy.shape[:-1] + (self.x.size,)
+        k = self.r.shape[0]
+        Fy2, Fz2 = Fy.reshape(-1, k), Fz.reshape(-1, k)
+        casos = Fy2.shape[0]
+
+        M = np.concatenate((Fy2, Fz2)) @ self.H.T
+        Mv, Mh = M[:casos], np.negative(M[casos:], out=M[casos:])
+        Mt = (Fz2 * self.r[:, 1] - Fy2 * self.r[:, 2]) @ self.S.T
+        return Mh.reshape(forma), Mv.reshape(forma), Mt.reshape(forma)
+
+    def reacoes(self, Fy, Fz):
+        # Ay, Az, By, Bz com a forma de Fy[..., 0]
+        Fy = np.asarray(Fy, dtype=float)
+        Fz = np.asarray(Fz, dtype=float)
+        return Fy @ self.ra, Fz @ self.ra, Fy @ self.rb, Fz @ self.rb
+
+
+# Matrizes de influência por geometria: só são recalculadas quando a geometria muda
+_MATRIZES = ResultCache(maximo=32)
+
+
+def matriz_influencia(comp_eixo, pos_apoio, r, x=None, n=1000) -> InfluenceMatrix:
+    return _MATRIZES(InfluenceMatrix, comp_eixo, tuple(pos_apoio), np.asarray(r, dtype=float), x, n)
+
+
+def reacoes_batch(pos_apoio, f, r):
+    # Equilíbrio de momentos em torno do apoio A e de forças em y e z.
+    # pos_apoio é (casos, 2); f e r são (casos, qt_forces, 3).
+    a, b = pos_apoio[:, 0], pos_apoio[:, 1]
+    r_rel = r.copy()
+    r_rel[:, :, 0] -= a[:, np.newaxis]
+    Ma = np.sum(np.cross(r_rel, f), axis=1)
+    d_apoio = b - a
+
+    By = -Ma[:, 2] / d_apoio
+    Bz = Ma[:, 1] / d_apoio
+    Ay = -By - np.sum(f[:, :, 1], axis=1)
+    Az = -Bz - np.sum(f[:, :, 2], axis=1)
+
+    zeros = np.zeros_like(Ay)
+    A = np.stack((zeros, Ay, Az), axis=-1)
+    B = np.stack((zeros, By, Bz), axis=-1)
+    return A, B
+
+
+def reacoes(modelo: ShaftModel):
+    A, B = reacoes_batch(
+        np.array([modelo.pos_apoio]), modelo.f[np.newaxis], modelo.r[np.newaxis]
+    )
+    return A[0], B[0]
+
+
+def torques(r, f):
+    # Componente x de r x F de cada força
+    return r[..., 1] * f[..., 2] - r[..., 2] * f[..., 1]
+
+
+def solve_statics_batch(comp_eixo, pos_apoio, f, r, n=1000, bloco=128) -> BatchResult:
+    # Resolve vários casos de carga de uma vez. f e r são (casos, qt_forces, 3);
+    # comp_eixo é escalar ou (casos,) e pos_apoio é (2,) ou (casos, 2).
+    # Mh, Mv e Mt são devolvidos como (casos, n).
+    f = np.asarray(f, dtype=float)
+    r = np.asarray(r, dtype=float)
+    casos = f.shape[0]
+    pos_apoio = np.broadcast_to(np.asarray(pos_apoio, dtype=float), (casos, 2))
+
+    # Geometria comum a todos os casos (ex.: espectro de cargas de uma engrenagem):
+    # a matriz de influência é reaproveitada e os casos saem de um produto de matrizes
+    if casos > 0 and np.ndim(comp_eixo) == 0 and np.all(pos_apoio == pos_apoio[0]) and np.all(r == r[0]):
+        matriz = matriz_influencia(comp_eixo, pos_apoio[0], r[0], n=n)
+        Mh, Mv, Mt = matriz.avaliar(f[:, :, 1], f[:, :, 2])
+        Ay, Az, By, Bz = matriz.reacoes(f[:, :, 1], f[:, :, 2])
+        zeros = np.zeros(casos)
+        A = np.stack((zeros, Ay, Az), axis=-1)
+        B = np.stack((zeros, By, Bz), axis=-1)
+        resultado = BatchResult(matriz.x, A, B, Mh, Mv, Mt)
+        for M in (Mh, Mv, Mt):
+            M[:, 0], M[:, -1] = 0.0, 0.0
+        return resultado
+
+    A, B = reacoes_batch(pos_apoio, f, r)
+
+    # Forças externas na ordem [A, B, F1, ..., Fk] e suas posições axiais
+    f_ext = np.concatenate((A[:, np.newaxis], B[:, np.newaxis], f), axis=1)
+    d = np.concatenate((pos_apoio, r[:, :, 0]), axis=1)
+    T = torques(r, f)
+
+    # Discretização do eixo: (n,) se o comprimento é comum, (casos, n) caso contrário
+    comp_eixo = np.asarray(comp_eixo, dtype=float)
+    x = np.linspace(0, comp_eixo, num=n, axis=-1)
+    x_casos = np.broadcast_to(x, (casos, n))
+
+    # Coeficientes de <x - d>: Mv = sum(Fy <x - d>) e Mh = -sum(Fz <x - d>)
+    coef = np.stack((f_ext[:, :, 1], -f_ext[:, :, 2]), axis=1)
+    Mh, Mv = np.empty((casos, n)), np.empty((casos, n))
+
+    # Funções de singularidade <x - d> por blocos de casos, para limitar a memória
+    for i in range(0, casos, bloco):
+        s = slice(i, i + bloco)
+        x_ = np.subtract(x_casos[s, np.newaxis, :], d[s, :, np.newaxis])
+        np.maximum(x_, 0.0, out=x_)
+        Mv[s], Mh[s] = np.moveaxis(coef[s] @ x_, 1, 0)
+
+    # Degrau do torque na posição de cada força
+    if x.ndim == 1:
+        idx = np.searchsorted(x, r[:, :, 0], side="left")
+        Mt = np.zeros((casos, n + 1))
+        np.add.at(Mt, (np.arange(casos)[:, np.newaxis], idx), T)
+        Mt = np.cumsum(Mt[:, :n], axis=1)
+    else:
+        Mt = np.empty((casos, n))
+        for i in range(0, casos, bloco):
+            s = slice(i, i + bloco)
+            degrau = (x[s, np.newaxis, :] >= r[s, :, 0, np.newaxis]).astype(float)
+            Mt[s] = (T[s, np.newaxis, :] @ degrau)[:, 0, :]
+
+    resultado = BatchResult(x, A, B, Mh, Mv, Mt)
+
+    # Correção dos Extremos dos Momentos
+    for M in (Mh, Mv, Mt):
+        M[:, 0], M[:, -1] = 0.0, 0.0
+
+    return resultado
+
+
+def diagrama_fletor(pos, forcas, comp_eixo) -> Diagrama:
+    # M(x) = sum F_i <x - d_i> = x * S1(x) - S2(x), com S1 e S2 somas acumuladas
+    # de F_i e F_i * d_i nas posições ordenadas. Vértices em 0, L e em cada d_i.
+    ordem = np.argsort(pos, kind="stable")
+    p, F = pos[ordem], forcas[ordem]
+    xk = np.unique(np.concatenate(([0.0, comp_eixo], np.clip(p, 0.0, comp_eixo))))
+
+    S1 = np.concatenate(([0.0], np.cumsum(F)))
+    S2 = np.concatenate(([0.0], np.cumsum(F * p)))
+    j = np.searchsorted(p, xk, side="right")
+    return Diagrama(xk, xk * S1[j] - S2[j])
+
+
+def diagrama_torque(pos, T, comp_eixo) -> Diagrama:
+    # Degraus de torque nas posições das forças (forças na mesma posição são somadas)
+    pu, inv = np.unique(pos, return_inverse=True)
+    saltos = np.bincount(inv.ravel(), weights=T, minlength=pu.size)
+    depois = np.cumsum(saltos)
+    antes = depois - saltos
+    final = depois[-1] if pu.size else 0.0
+
+    xk = np.concatenate(([0.0], np.repeat(pu, 2), [comp_eixo]))
+    yk = np.concatenate(([0.0], np.column_stack((antes, depois)).ravel(), [final]))
+    return Diagrama(xk, yk)
+
+
+def solve_statics(modelo: ShaftModel) -> StaticsResult:
+    A, B = reacoes(modelo)
+
+    pos = np.concatenate((modelo.pos_apoio, modelo.r[:, 0]))
+    Fy = np.concatenate(([A[1], B[1]], modelo.f[:, 1]))
+    Fz = np.concatenate(([A[2], B[2]], modelo.f[:, 2]))
+
+    Mh = diagrama_fletor(pos, -Fz, modelo.comp_eixo)
+    Mv = diagrama_fletor(pos, Fy, modelo.comp_eixo)
+    Mt = diagrama_torque(modelo.r[:, 0], torques(modelo.r, modelo.f), modelo.comp_eixo)
+    return StaticsResult(A, B, Mh, Mv, Mt)
+
+
+# Identificadores das forças do IncrementalStatics, únicos no processo (um solver novo
+# não reaproveita os de outro)
+_IDS_FORCAS = itertools.count()
+
+
+class IncrementalStatics:
+    # Análise estática editável força a força. A contribuição de cada força (reações,
+    # coeficientes de <x - d> e degrau de torque) é guardada separadamente e somada ou
+    # subtraída dos totais: adicionar, editar ou remover uma força não recalcula as
+    # demais, e montar os diagramas só percorre as posições distintas.
+    def __init__(self, comp_eixo, pos_apoio) -> None:
+        self.comp_eixo = float(comp_eixo)
+        self.pos_apoio = (float(pos_apoio[0]), float(pos_apoio[1]))
+        # f e r são substituídos (não alterados) a cada edição, então cópias antigas
+        # continuam válidas para quem ainda as estiver usando
+        self.f = np.zeros((0, 3))
+        self.r = np.zeros((0, 3))
+        # Identificador estável de cada força: o índice muda quando outra é removida
+        self.ids = []
+        self.contribuicoes = []
+        self.A = np.zeros(3)
+        self.B = np.zeros(3)
+        # Por posição axial: [coeficiente de Mv, coeficiente de Mh, degrau de torque] e
+        # quantos termos a usam (a posição sai dos diagramas quando chega a zero)
+        self.totais = {}
+        self.contagem = {}
+
+    def _contribuicao(self, f, r):
+        A, B = reacoes_batch(np.array([self.pos_apoio]), f[np.newaxis, np.newaxis], r[np.newaxis, np.newaxis])
+        A, B = A[0], B[0]
+        termos = (
+            (self.pos_apoio[0], np.array([A[1], -A[2], 0.0])),
+            (self.pos_apoio[1], np.array([B[1], -B[2], 0.0])),
+            (float(r[0]), np.array([f[1], -f[2], torques(r, f)])),
+        )
+        return A, B, termos
+
+    def _somar(self, contribuicao, sinal):
+        A, B, termos = contribuicao
+        self.A = self.A + sinal * A
+        self.B = self.B + sinal * B
+        for x, valor in termos:
+            self.contagem[x] = self.contagem.get(x, 0) + sinal
+            if self.contagem[x] == 0:
+                del self.contagem[x]
+                del self.totais[x]
+            else:
+                self.totais[x] = self.totais.get(x, 0.0) + sinal * valor
+
+        # Sem forças os totais voltam a zero exato (sem resíduo de arredondamento)
+        if not self.contagem:
+            self.A, self.B = np.zeros(3), np.zeros(3)
+
+    def adicionar(self, f, r):
+        f = np.asarray(f, dtype=float).reshape(3)
+        r = np.asarray(r, dtype=float).reshape(3)
+        contribuicao = self._contribuicao(f, r)
+        self._somar(contribuicao, 1)
+        self.contribuicoes.append(contribuicao)
+        self.f = np.vstack((self.f, f))
+        self.r = np.vstack((self.r, r))
+        self.ids = self.ids + [next(_IDS_FORCAS)]
+        return self.ids[-1]
+
+    def indice(self, ident):
+        # Posição atual da força com esse identificador (None se já foi removida)
+        return self.ids.index(ident) if ident in self.ids else None
+
+    def editar(self, i, f, r):
+        f = np.asarray(f, dtype=float).reshape(3)
+        r = np.asarray(r, dtype=float).reshape(3)
+        self._somar(self.contribuicoes[i], -1)
+        contribuicao = self._contribuicao(f, r)
+        self._somar(contribuicao, 1)
+        self.contribuicoes[i] = contribuicao
+        self.f, self.r = self.f.copy(), self.r.copy()
+        self.f[i], self.r[i] = f, r
+
+    def remover(self, i):
+        self._somar(self.contribuicoes.pop(i), -1)
+        self.f = np.delete(self.f, i, axis=0)
+        self.r = np.delete(self.r, i, axis=0)
+        self.ids = self.ids[:i] + self.ids[i + 1:]
+
+    def resultado(self) -> StaticsResult:
+        pos = np.array(sorted(self.totais), dtype=float)
+        valores = np.array([self.totais[x] for x in pos], dtype=float).reshape(-1, 3)
+
+        Mh = diagrama_fletor(pos, valores[:, 1], self.comp_eixo)
+        Mv = diagrama_fletor(pos, valores[:, 0], self.comp_eixo)
+        Mt = diagrama_torque(pos, valores[:, 2], self.comp_eixo)
+        return StaticsResult(self.A, self.B, Mh, Mv, Mt)
+
+
+def envoltoria_carga_movel(modelo: ShaftModel, moveis, posicoes, n=1000, bloco=256) -> EnvelopeResult:
+    # As forças de índices moveis andam juntas (ex.: engrenagem e polia de um mesmo
+    # cubo), mantendo a distância entre si: em cada caso a primeira delas fica em
+    # posicoes[k]. Posições que levariam alguma delas para fora do eixo são descartadas.
+    # As forças fixas são resolvidas uma vez; a parte móvel é somada por broadcasting
+    # sobre (posições, estações), e as estações incluem todas as posições das cargas.
+    moveis = np.atleast_1d(np.asarray(moveis, dtype=int))
+    posicoes = np.atleast_1d(np.asarray(posicoes, dtype=float))
+    L = modelo.comp_eixo
+    a, b = modelo.pos_apoio
+
+    d = posicoes[:, np.newaxis] + (modelo.r[moveis, 0] - modelo.r[moveis[0], 0])
+    validos = np.all((d >= 0.0) & (d <= L), axis=1)
+    posicoes, d = posicoes[validos], d[validos]
+    if posicoes.size == 0:
+        raise ValueError("Nenhuma posição mantém as cargas móveis dentro do eixo")
+
+    fixas = np.setdiff1d(np.arange(modelo.qt_forces), moveis)
+    fixo = solve_statics(ShaftModel(L, modelo.pos_apoio, modelo.f[fixas], modelo.r[fixas]))
+    x = np.unique(np.concatenate((np.linspace(0.0, L, num=n), fixo.Mh.xk, fixo.Mt.xk, d.ravel())))
+    Mh0, Mv0, Mt0 = fixo.avaliar(x)
+
+    # Reações de cada carga móvel em cada posição: (posições, móveis)
+    Fy, Fz = modelo.f[moveis, 1], modelo.f[moveis, 2]
+    T = torques(modelo.r[moveis], modelo.f[moveis])
+    ra = -(b - d) / (b - a)
+    rb = -(d - a) / (b - a)
+    zeros = np.zeros(posicoes.size)
+    A = fixo.A + np.stack((zeros, ra @ Fy, ra @ Fz), axis=-1)
+    B = fixo.B + np.stack((zeros, rb @ Fy, rb @ Fz), axis=-1)
+
+    sa, sb = np.maximum(x - a, 0.0), np.maximum(x - b, 0.0)
+    infinito = np.full(x.size, np.inf)
+    Mh_env = [infinito.copy(), -infinito]
+    Mv_env = [infinito.copy(), -infinito]
+    Mt_env = [infinito.copy(), -infinito]
+    Mr_max = np.zeros(x.size)
+    Mr_pico = np.empty(posicoes.size)
+
+    # Blocos de posições para limitar a memória a (bloco, estações)
+    for i in range(0, posicoes.size, bloco):
+        s = slice(i, i + bloco)
+        Mh, Mv, Mt = np.tile(Mh0, (d[s].shape[0], 1)), np.tile(Mv0, (d[s].shape[0], 1)), np.tile(Mt0, (d[s].shape[0], 1))
+        for j in range(moveis.size):
+            dj = d[s, j, np.newaxis]
+            unitario = np.maximum(x - dj, 0.0) + ra[s, j, np.newaxis] * sa + rb[s, j, np.newaxis] * sb
+            Mv += Fy[j] * unitario
+            Mh -= Fz[j] * unitario
+            Mt += T[j] * (x >= dj)
+        Mr = np.hypot(Mh, Mv)
+
+        for env, M in ((Mh_env, Mh), (Mv_env, Mv), (Mt_env, Mt)):
+            np.minimum(env[0], M.min(axis=0), out=env[0])
+            env[1] = np.maximum(env[1], M.max(axis=0))
+        np.maximum(Mr_max, Mr.max(axis=0), out=Mr_max)
+        Mr_pico[s] = Mr.max(axis=1)
+
+    return EnvelopeResult(
+        x, posicoes, Mh_env, Mv_env, Mr_max, Mt_env,
+        (A.min(axis=0), A.max(axis=0)), (B.min(axis=0), B.max(axis=0)), Mr_pico,
+    )
+
+
+def varredura_fases(modelo: ShaftModel, rotativas, angulos, n=1000, bloco=256, maximo=1_000_000) -> PhaseSweepResult:
+    # As forças de índices rotativas giram (no plano yz) por cada ângulo da grade
+    # angulos (graus), independentemente umas das outras; as demais ficam fixas. Para
+    # varrer a fase relativa a uma carga de referência, deixe-a fora de rotativas.
+    # Com W = Mv - j*Mh, cada força contribui H[:, i] * (Fy + j*Fz): girar a força é
+    # multiplicar por exp(j*fase), e todas as combinações de um bloco saem de um único
+    # produto complexo (combinações, rotativas) @ (rotativas, estações). O torque não
+    # depende da fase.
+    rotativas = np.atleast_1d(np.asarray(rotativas, dtype=int))
+    angulos = np.atleast_1d(np.asarray(angulos, dtype=float))
+    L = modelo.comp_eixo
+    k, m = rotativas.size, angulos.size
+    total = m**k
+    if total > maximo:
+        raise ValueError(f"{total} combinações de fases (máximo {maximo}): use menos ângulos ou menos cargas rotativas")
+
+    fixas = np.setdiff1d(np.arange(modelo.qt_forces), rotativas)
+    fixo = solve_statics(ShaftModel(L, modelo.pos_apoio, modelo.f[fixas], modelo.r[fixas]))
+    x = np.unique(np.concatenate((np.linspace(0.0, L, num=n), fixo.Mh.xk, modelo.r[rotativas, 0])))
+    Mh0, Mv0, _ = fixo.avaliar(x)
+    W0 = Mv0 - 1j * Mh0
+    A0 = fixo.A[1] + 1j * fixo.A[2]
+    B0 = fixo.B[1] + 1j * fixo.B[2]
+
+    matriz = InfluenceMatrix(L, modelo.pos_apoio, modelo.r[rotativas], x)
+    F = modelo.f[rotativas, 1] + 1j * modelo.f[rotativas, 2]
+    G = (matriz.H * F).T
+    Ga, Gb = matriz.ra * F, matriz.rb * F
+    giro = np.exp(1j * np.radians(angulos))
+
+    infinito = np.full(x.size, np.inf)
+    Mh_env = [infinito.copy(), -infinito]
+    Mv_env = [infinito.copy(), -infinito]
+    Mr_max = np.zeros(x.size)
+    Mr_pico = np.empty(total)
+    Ar = np.empty(total)
+    Br = np.empty(total)
+
+    # Blocos de combinações para limitar a memória a (bloco, estações)
+    for i in range(0, total, bloco):
+        indices = np.stack(np.unravel_index(np.arange(i, min(i + bloco, total)), (m,) * k), axis=-1)
+        E = giro[indices]
+        W = W0 + E @ G
+        Mh, Mv, Mr = -W.imag, W.real, np.abs(W)
+
+        for env, M in ((Mh_env, Mh), (Mv_env, Mv)):
+            np.minimum(env[0], M.min(axis=0), out=env[0])
+            env[1] = np.maximum(env[1], M.max(axis=0))
+        np.maximum(Mr_max, Mr.max(axis=0), out=Mr_max)
+        Mr_pico[i:i + bloco] = Mr.max(axis=1)
+        Ar[i:i + bloco] = np.abs(A0 + E @ Ga)
+        Br[i:i + bloco] = np.abs(B0 + E @ Gb)
+
+    def fases(j):
+        return angulos[np.array(np.unravel_index(int(j), (m,) * k))]
+
+    ja, jb = int(np.argmax(Ar)), int(np.argmax(Br))
+    return PhaseSweepResult(
+        x, angulos, Mh_env, Mv_env, Mr_max, Mr_pico, fases(np.argmax(Mr_pico)),
+        float(Ar[ja]), fases(ja), float(Br[jb]), fases(jb),
+    )
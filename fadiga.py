@@ -0,0 +1,306 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Critérios de falha por fadiga e estáticos: diâmetro e coeficiente de segurança
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+
+from estatica import StaticsResult
+
+
+PI = np.pi
+
+CRITERIOS = {
+    # "Critério": Nome exibido nos resultados
+    "Goodman": "GOODMAN",
+    "Gerber": "GERBER",
+    "ASME Elíptico": "ASME ELÍPTICO",
+    "Soderberg": "SODERBERG",
+    "Langer (Estático)": "Langer",
+    "von Mises (Estático)": "von Mises",
+    "Tresca (Estático)": "Tresca",
+}
+
+FATOR_TAMANHO = {
+    # Opção do kb: {unidade de comprimento: (multiplicador, expoente)} -> kb = mult * d ** (-expoente)
+    "1": {"m": (0.592, 0.107), "in": (0.879, 0.107)},
+    "2": {"m": (0.51, 0.157), "in": (0.91, 0.157)},
+}
+
+LISTA_MATERIAIS = {
+    # "Material": [Tensão Ruptura (MPA), Tensão Ruptura (ksi), Tensão Escoamento(MPa), Tensão Escoamento(ksi)]
+    "SAE 1006 LQ": [300, 43, 170, 24],
+    "SAE 1006 LF": [330, 48, 280, 41],
+    "SAE 1010 LQ": [320, 47, 180, 26],
+    "SAE 1010 LF": [370, 53, 300, 44],
+    "SAE 1015 LQ": [340, 50, 190, 27.5],
+    "SAE 1015 LF": [390, 56, 320, 47],
+    "SAE 1018 LQ": [400, 58, 220, 32],
+    "SAE 1018 LF": [440, 64, 370, 54],
+    "SAE 1020 LQ": [380, 55, 210, 30],
+    "SAE 1020 LF": [470, 68, 390, 57],
+    "SAE 1030 LQ": [470, 68, 260, 37.5],
+    "SAE 1030 LF": [520, 76, 440, 64],
+    "SAE 1035 LQ": [500, 72, 270, 39.5],
+    "SAE 1035 LF": [550, 80, 460, 67],
+    "SAE 1040 LQ": [520, 76, 290, 42],
+    "SAE 1040 LF": [590, 85, 490, 71],
+    "SAE 1045 LQ": [570, 82, 310, 45],
+    "SAE 1045 LF": [630, 91, 530, 77],
+    "SAE 1050 LQ": [620, 90, 340, 49.5],
+    "SAE 1050 LF": [690, 90, 580, 84],
+    "SAE 1060 LQ": [680, 98, 370, 54],
+    "SAE 1080 LQ": [770, 112, 420, 61.5],
+    "SAE 1095 LQ": [830, 120, 460, 66],
+}
+
+DIAMETROS_PADRAO = {
+    # Diâmetros padronizados usados no escalonamento do eixo
+    "m": np.concatenate((np.arange(10, 20, 1), np.arange(20, 100, 5), np.arange(100, 510, 10))) * 1e-3,
+    "in": np.concatenate((np.arange(4, 32) / 16, np.arange(16, 32) / 8, np.arange(16, 41) / 4)),
+}
+
+
+class FatigueModel:
+    # Esforços, fatores de concentração e resistências (em unidades coerentes: Pa/psi).
+    # Todos os valores podem ser arrays (broadcasting). Se kb = (mult, expoente),
+    # Se é o limite de fadiga sem o fator de tamanho, que passa a depender de d.
+    def __init__(
+        self,
+        Kff=1.0,
+        Kfs=1.0,
+        Ma=0.0,
+        Mm=0.0,
+        Ta=0.0,
+        Tm=0.0,
+        Mmax=0.0,
+        Tmax=0.0,
+        Se=1.0,
+        Sut=1.0,
+        Sy=1.0,
+        kb=None,
+    ) -> None:
+        self.Kff = np.asarray(Kff, dtype=float)
+        self.Kfs = np.asarray(Kfs, dtype=float)
+        self.Ma = np.asarray(Ma, dtype=float)
+        self.Mm = np.asarray(Mm, dtype=float)
+        self.Ta = np.asarray(Ta, dtype=float)
+        self.Tm = np.asarray(Tm, dtype=float)
+        self.Mmax = np.asarray(Mmax, dtype=float)
+        self.Tmax = np.asarray(Tmax, dtype=float)
+        self.Se = np.asarray(Se, dtype=float)
+        self.Sut = np.asarray(Sut, dtype=float)
+        self.Sy = np.asarray(Sy, dtype=float)
+        self.kb = kb
+
+    def limite_fadiga(self, d):
+        if self.kb is None:
+            return self.Se
+        mult, expoente = self.kb
+        return self.Se * mult * d ** (-expoente)
+
+
+class DiameterProfile:
+    # Eixo escalonado: ressaltos nas posições dadas e um diâmetro por trecho
+    def __init__(self, diametros, ressaltos=()) -> None:
+        self.diametros = np.atleast_1d(np.asarray(diametros, dtype=float))
+        self.ressaltos = np.sort(np.atleast_1d(np.asarray(ressaltos, dtype=float)))
+
+        if self.diametros.size != self.ressaltos.size + 1:
+            raise ValueError("É preciso um diâmetro a mais que o número de ressaltos")
+
+    def __call__(self, x, esquerda=False):
+        # No ressalto, esquerda=True devolve o diâmetro do trecho anterior
+        i = np.where(
+            esquerda,
+            np.searchsorted(self.ressaltos, x, side="left"),
+            np.searchsorted(self.ressaltos, x, side="right"),
+        )
+        return self.diametros[i]
+
+
+class CSProfile:
+    def __init__(self, x, cs) -> None:
+        self.x = x
+        self.cs = cs
+        i = int(np.argmin(np.where(np.isnan(cs), np.inf, cs)))
+        self.cs_min = float(cs[i])
+        self.x_critico = float(x[i])
+
+
+def _termos(m: FatigueModel):
+    # Intermediários comuns a todos os critérios
+    A = np.sqrt(4 * (m.Kff * m.Ma) ** 2 + 3 * (m.Kfs * m.Ta) ** 2)
+    B = np.sqrt(4 * (m.Kff * m.Mm) ** 2 + 3 * (m.Kfs * m.Tm) ** 2)
+    return A, B, m.Ma + m.Mm, m.Ta + m.Tm
+
+
+def _cargas_equivalentes(m: FatigueModel, Se, criterios=CRITERIOS, termos=None):
+    # Todos os critérios têm a forma CS = PI * d**3 / (16 * Q), com Q uma "carga
+    # equivalente" que só depende dos esforços e das resistências; A e B são
+    # calculados uma única vez e compartilhados entre os critérios.
+    A, B, M, T = _termos(m) if termos is None else termos
+
+    Q = {}
+    for criterio in criterios:
+        if criterio == "Goodman":
+            Q[criterio] = A / Se + B / m.Sut
+        elif criterio == "Gerber":
+            # Para A = 0 o limite da expressão é B / Sut
+            razao = np.divide(2 * B * Se, A * m.Sut, out=np.zeros(np.broadcast(A, B, Se).shape), where=A > 0)
+            Q[criterio] = np.where(A > 0, A / (2 * Se) * (1 + np.sqrt(1 + razao**2)), B / m.Sut)
+        elif criterio == "ASME Elíptico":
+            Q[criterio] = np.sqrt((A / Se) ** 2 + (B / m.Sy) ** 2)
+        elif criterio == "Soderberg":
+            Q[criterio] = A / Se + B / m.Sy
+        elif criterio == "Langer (Estático)":
+            Q[criterio] = np.sqrt(4 * (m.Kff * m.Mmax) ** 2 + 3 * (m.Kfs * m.Tmax) ** 2) / m.Sy
+        elif criterio == "von Mises (Estático)":
+            Q[criterio] = np.sqrt(4 * (m.Kff * M) ** 2 + 3 * (m.Kfs * T) ** 2) / m.Sy
+        elif criterio == "Tresca (Estático)":
+            Q[criterio] = 2 * np.sqrt((m.Kff * M) ** 2 + (m.Kfs * T) ** 2) / m.Sy
+        else:
+            raise ValueError(f"Critério desconhecido: {criterio}")
+    return Q
+
+
+def coeficientes_seguranca(d, m: FatigueModel, criterios=CRITERIOS):
+    # CS de todos os critérios em uma única avaliação
+    d = np.asarray(d, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Q = _cargas_equivalentes(m, m.limite_fadiga(d), criterios)
+        return {criterio: PI * d**3 / (16 * Q[criterio]) for criterio in Q}
+
+
+def coeficiente_seguranca(criterio, d, m: FatigueModel):
+    return coeficientes_seguranca(d, m, (criterio,))[criterio]
+
+
+def diametros(CS, m: FatigueModel, criterios=CRITERIOS, tol=1e-12, max_iter=50):
+    # Forma fechada (raiz cúbica) quando Se é constante. Com kb = mult * d ** (-expoente)
+    # usa iteração de ponto fixo, que contrai com fator ~expoente / 3 (< 0.06).
+    with np.errstate(divide="ignore", invalid="ignore"):
+        termos = _termos(m)
+        Q = _cargas_equivalentes(m, m.Se, criterios, termos)
+        d = {criterio: np.cbrt(16 * CS * Q[criterio] / PI) for criterio in Q}
+        if m.kb is None:
+            return d
+
+        for _ in range(max_iter):
+            convergiu = True
+            for criterio in d:
+                Se = m.limite_fadiga(d[criterio])
+                Qc = _cargas_equivalentes(m, Se, (criterio,), termos)[criterio]
+                d_novo = np.cbrt(16 * CS * Qc / PI)
+                convergiu &= bool(np.all(np.abs(d_novo - d[criterio]) <= tol * np.abs(d_novo)))
+                d[criterio] = d_novo
+            if convergiu:
+                break
+    return d
+
+
+def diametro(criterio, CS, m: FatigueModel, tol=1e-12, max_iter=50):
+    return diametros(CS, m, (criterio,), tol, max_iter)[criterio]
+
+
+def _modelo_estacoes(Mh, Mv, Mt, m: FatigueModel):
+    # Flexão rotativa é totalmente alternada (Ma = |M|, Mm = 0) e o torque é
+    # considerado médio (Tm = |Mt|, Ta = 0); Kff, Kfs e as resistências vêm de m
+    Ma = np.hypot(Mh, Mv)
+    Tm = np.abs(Mt)
+    return FatigueModel(
+        m.Kff, m.Kfs, Ma=Ma, Tm=Tm, Mmax=Ma, Tmax=Tm,
+        Se=m.Se, Sut=m.Sut, Sy=m.Sy, kb=m.kb,
+    )
+
+
+def coeficientes_seguranca_estacoes(Mh, Mv, Mt, d, m: FatigueModel, criterios=CRITERIOS):
+    return coeficientes_seguranca(d, _modelo_estacoes(Mh, Mv, Mt, m), criterios)
+
+
+def diametros_estacoes(Mh, Mv, Mt, CS, m: FatigueModel, criterios=CRITERIOS):
+    return diametros(CS, _modelo_estacoes(Mh, Mv, Mt, m), criterios)
+
+
+def perfil_cs(resultado: StaticsResult, perfil: DiameterProfile, m: FatigueModel, criterios=CRITERIOS, n=1000):
+    # CS em todas as estações do eixo de uma vez, para cada critério, com a seção crítica
+    x, esquerda = resultado.estacoes(n, perfil.ressaltos)
+    Mh, Mv, Mt = resultado.avaliar(x, esquerda)
+    cs = coeficientes_seguranca_estacoes(Mh, Mv, Mt, perfil(x, esquerda), m, criterios)
+    return {criterio: CSProfile(x, cs[criterio]) for criterio in cs}
+
+
+def perfil_diametro(resultado: StaticsResult, CS, m: FatigueModel, criterios=CRITERIOS, n=1000):
+    # Diâmetro mínimo d(x) para o CS desejado em todas as estações do eixo
+    x, esquerda = resultado.estacoes(n)
+    Mh, Mv, Mt = resultado.avaliar(x, esquerda)
+    return x, diametros_estacoes(Mh, Mv, Mt, CS, m, criterios)
+
+
+def escalonar(x, d_req, max_trechos=3, padroes=None, candidatos=(), n_candidatos=41):
+    # Propõe um eixo escalonado de volume mínimo que cobre d_req(x): os ressaltos
+    # ficam em posições candidatas e cada trecho recebe o menor diâmetro padronizado
+    # que atende o maior d_req do trecho. O custo de todos os trechos possíveis é
+    # calculado de uma vez (matriz c x c) e a programação dinâmica escolhe o arranjo.
+    x = np.asarray(x, dtype=float)
+    d_req = np.asarray(d_req, dtype=float)
+    p = np.linspace(x[0], x[-1], num=n_candidatos)
+    p = np.unique(np.concatenate((p, np.clip(np.asarray(candidatos, dtype=float), x[0], x[-1]))))
+    c = p.size
+
+    # Maior d_req entre candidatos consecutivos (extremos incluídos)
+    lo = np.searchsorted(x, p[:-1], side="left")
+    hi = np.searchsorted(x, p[1:], side="right")
+    maximos = np.maximum.reduceat(np.append(d_req, -np.inf), np.column_stack((lo, hi)).ravel())[::2]
+
+    # d_trecho[i, j]: maior d_req no trecho de p[i] a p[j + 1]
+    i, j = np.indices((c - 1, c - 1))
+    d_trecho = np.maximum.accumulate(np.where(j >= i, maximos[np.newaxis, :], -np.inf), axis=1)
+    if padroes is not None:
+        padroes = np.asarray(padroes, dtype=float)
+        k = np.searchsorted(padroes, d_trecho, side="left")
+        d_trecho = np.where(k < padroes.size, padroes[np.minimum(k, padroes.size - 1)], np.inf)
+
+    # custo[i, j]: volume do trecho de p[i] a p[j]
+    custo = np.full((c, c), np.inf)
+    with np.errstate(invalid="ignore"):
+        custo[:-1, 1:] = np.where(j >= i, PI / 4 * d_trecho**2 * (p[1:] - p[:-1, np.newaxis]), np.inf)
+    diam = np.full((c, c), np.nan)
+    diam[:-1, 1:] = d_trecho
+
+    melhor = [custo[0]]
+    anteriores = [None]
+    for _ in range(1, max_trechos):
+        total = melhor[-1][:, np.newaxis] + custo
+        anterior = np.argmin(total, axis=0)
+        melhor.append(total[anterior, np.arange(c)])
+        anteriores.append(anterior)
+
+    trechos = int(np.argmin([v[-1] for v in melhor]))
+    volume = float(melhor[trechos][-1])
+
+    # Reconstrução dos ressaltos a partir do último trecho
+    fim = c - 1
+    ressaltos, diametros_ = [], []
+    for s in range(trechos, 0, -1):
+        inicio = int(anteriores[s][fim])
+        ressaltos.append(p[inicio])
+        diametros_.append(diam[inicio, fim])
+        fim = inicio
+    diametros_.append(diam[0, fim])
+
+    return DiameterProfile(diametros_[::-1], ressaltos[::-1]), volume
@@ -0,0 +1,216 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Modo em lote pela linha de comando (sem Flet/Matplotlib): python -m lote casos.jsonl
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+from cache import ResultCache
+from estatica import ShaftModel, solve_statics
+from fadiga import CRITERIOS, LISTA_MATERIAIS, DiameterProfile, FatigueModel, perfil_cs, perfil_diametro
+
+
+# Mesmos sistemas de unidades da interface: tensões digitadas em MPa ou ksi
+UNIDADES = {
+    "SI": {"comprimento": "m", "fator_cs": 1_000_000, "material": (0, 2)},
+    "US": {"comprimento": "in", "fator_cs": 1_000, "material": (1, 3)},
+}
+
+# Aceita tanto o nome do critério quanto o nome exibido (sem diferenciar maiúsculas)
+NOMES_CRITERIOS = {nome.lower(): nome for nome in CRITERIOS}
+NOMES_CRITERIOS.update({rotulo.lower(): nome for nome, rotulo in CRITERIOS.items()})
+
+# Variantes repetidas no mesmo lote (ou entre execuções, com --cache) não são recalculadas
+CACHE = ResultCache(maximo=1024)
+
+COLUNAS = (
+    "id", "Ay", "Az", "By", "Bz", "Mh_max", "x_Mh_max", "Mv_max", "x_Mv_max", "Mt_max",
+    "criterio", "d", "CS", "x_critico", "erro",
+)
+
+
+def _forcas(valor):
+    # Cada força é (Fy, Fz, rx, ry, rz), como na interface. No CSV as forças são
+    # separadas por ";" e os componentes por espaços (ex.: "-197 540 2.75 6 0; ...")
+    if isinstance(valor, str):
+        valor = [linha.split() for linha in valor.split(";") if linha.strip() != ""]
+    return np.array(valor, dtype=float).reshape(-1, 5)
+
+
+def _numero(caso, chave, padrao=None):
+    valor = caso.get(chave)
+    if valor is None or valor == "":
+        if padrao is None:
+            raise ValueError(f"Campo obrigatório ausente: {chave}")
+        return padrao
+    return float(valor)
+
+
+def ler_jsonl(arquivo):
+    # Uma linha que não é JSON válido vira o próprio erro, reportado por processar
+    # como uma linha de resultado
+    for linha in arquivo:
+        if linha.strip() != "":
+            try:
+                yield json.loads(linha)
+            except ValueError as erro:
+                yield erro
+
+
+def ler_csv(arquivo):
+    yield from csv.DictReader(arquivo)
+
+
+def calcular(caso, indice=0, cache=None):
+    # Um caso de entrada (dict) -> uma linha de resultado (dict). O resultado só depende
+    # dos dados do caso (não do id), então variantes repetidas vêm do cache com um único
+    # hash das entradas da estática e da fadiga.
+    if cache is None:
+        cache = CACHE
+    dados = {chave: valor for chave, valor in caso.items() if chave != "id"}
+    linha = cache(_calcular, dados, unidades=str(caso.get("unidades") or "SI").upper())
+    return {"id": _identificador(caso, indice), **linha}
+
+
+def _identificador(caso, indice):
+    # O id do caso quando existe (mesmo 0 ou ""), senão a posição no lote
+    return caso["id"] if isinstance(caso, dict) and "id" in caso else indice
+
+
+def _calcular(caso):
+    # Com "d" calcula o CS mínimo ao longo do eixo; com "CS" calcula o diâmetro mínimo
+    # necessário
+    unidades = UNIDADES[str(caso.get("unidades") or "SI").upper()]
+    fator_cs = unidades["fator_cs"]
+
+    forcas = _forcas(caso["forcas"])
+    f = np.column_stack((np.zeros(forcas.shape[0]), forcas[:, 0], forcas[:, 1]))
+    r = forcas[:, 2:]
+    modelo = ShaftModel(_numero(caso, "comp_eixo"), (_numero(caso, "apoio_1"), _numero(caso, "apoio_2")), f, r)
+    resultado = solve_statics(modelo)
+
+    # Sut e Sy digitados têm prioridade sobre os do material da lista
+    Sut, Sy = None, None
+    if caso.get("material"):
+        i_ruptura, i_escoamento = unidades["material"]
+        Sut = LISTA_MATERIAIS[caso["material"]][i_ruptura]
+        Sy = LISTA_MATERIAIS[caso["material"]][i_escoamento]
+    Sut, Sy = _numero(caso, "Sut", Sut), _numero(caso, "Sy", Sy)
+
+    # Se direto ou Se' (padrão 0.5 * Sut) corrigido pelos fatores de Marin
+    Se = _numero(caso, "Se_linha", 0.5 * Sut)
+    for fator in ("ka", "kb", "kc", "kd", "ke"):
+        Se *= _numero(caso, fator, 1.0)
+    Se = _numero(caso, "Se", Se)
+
+    m = FatigueModel(
+        _numero(caso, "Kff", 1.0), _numero(caso, "Kfs", 1.0),
+        Se=Se * fator_cs, Sut=Sut * fator_cs, Sy=Sy * fator_cs,
+    )
+    criterio = NOMES_CRITERIOS[str(caso.get("criterio") or "Goodman").lower()]
+
+    linha = {
+        "Ay": resultado.A[1], "Az": resultado.A[2], "By": resultado.B[1], "Bz": resultado.B[2],
+        "Mh_max": resultado.Mh_max, "x_Mh_max": resultado.x_Mh_max,
+        "Mv_max": resultado.Mv_max, "x_Mv_max": resultado.x_Mv_max,
+        "Mt_max": resultado.Mt.maximo()[0],
+        "criterio": criterio,
+    }
+
+    if caso.get("d") not in (None, ""):
+        d = _numero(caso, "d")
+        perfil = perfil_cs(resultado, DiameterProfile([d]), m, (criterio,), n=2)[criterio]
+        linha.update(d=d, CS=perfil.cs_min, x_critico=perfil.x_critico)
+    else:
+        CS = _numero(caso, "CS")
+        x, requeridos = perfil_diametro(resultado, CS, m, (criterio,), n=2)
+        i = int(np.argmax(requeridos[criterio]))
+        linha.update(d=float(requeridos[criterio][i]), CS=CS, x_critico=float(x[i]))
+
+    return {chave: float(valor) if isinstance(valor, np.floating) else valor for chave, valor in linha.items()}
+
+
+def processar(casos, cache=None):
+    # Um erro em um caso vira uma linha com o campo "erro", sem interromper o lote
+    for indice, caso in enumerate(casos):
+        try:
+            if isinstance(caso, Exception):
+                raise caso
+            if not isinstance(caso, dict):
+                raise ValueError(f"O caso deve ser um objeto, não {type(caso).__name__}")
+            linha = calcular(caso, indice, cache)
+        except Exception as erro:
+            linha = {"id": _identificador(caso, indice), "erro": f"{type(erro).__name__}: {erro}"}
+        yield linha
+
+
+def escrever_jsonl(linhas, arquivo):
+    for linha in linhas:
+        arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+
+
+def escrever_csv(linhas, arquivo):
+    escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS, lineterminator="\n")
+    escritor.writeheader()
+    for linha in linhas:
+        escritor.writerow(linha)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lote", description="Análise de eixos em lote (CSV ou JSONL).")
+    parser.add_argument("entrada", help="arquivo de casos (.csv ou .jsonl); '-' para a entrada padrão")
+    parser.add_argument("-o", "--saida", default="-", help="arquivo de resultados; '-' para a saída padrão")
+    parser.add_argument("--formato-entrada", choices=("csv", "jsonl"), help="padrão: pela extensão (jsonl para '-')")
+    parser.add_argument("--formato-saida", choices=("csv", "jsonl"), help="padrão: pela extensão (jsonl para '-')")
+    parser.add_argument("--cache", metavar="PASTA", help="guarda os resultados em disco para as próximas execuções")
+    args = parser.parse_args(argv)
+
+    def formato(caminho, escolhido):
+        return escolhido or ("csv" if caminho.lower().endswith(".csv") else "jsonl")
+
+    formato_entrada = formato(args.entrada, args.formato_entrada)
+    formato_saida = formato(args.saida, args.formato_saida)
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, newline="", encoding="utf-8")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", newline="", encoding="utf-8")
+    cache = ResultCache(maximo=CACHE.maximo, pasta=args.cache) if args.cache else CACHE
+    try:
+        casos = ler_csv(entrada) if formato_entrada == "csv" else ler_jsonl(entrada)
+        linhas = processar(casos, cache)
+        if formato_saida == "csv":
+            escrever_csv(linhas, saida)
+        else:
+            escrever_jsonl(linhas, saida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+
+    if args.cache:
+        e = cache.estatisticas()
+        print(f"cache: {e['acertos']} acertos ({e['acertos_disco']} do disco), {e['falhas']} falhas", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,25 +20,48 @@
 # LICENÇA: GPL-3.0-or-later
 # VERSÃO: 0
 
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from time import perf_counter
+
+# Referência para o relatório de tempos de inicialização
+INICIO = perf_counter()
+
 from flet import (
     AlertDialog,
     AppView,
     Card,
+    ChartAxis,
+    ChartAxisLabel,
+    ChartCirclePoint,
+    ChartGridLines,
     Column,
     Container,
     CrossAxisAlignment,
     Dropdown,
+    FilePicker,
+    FilePickerUploadFile,
     FilledButton,
     FontWeight,
     IconButton,
     Image,
     ImageFit,
+    LineChart,
+    LineChartData,
+    LineChartDataPoint,
     LinearGradient,
     ListView,
     MainAxisAlignment,
     Page,
     PopupMenuButton,
     PopupMenuItem,
+    ProgressRing,
     Radio,
     RadioGroup,
     ResponsiveRow,
@@ -65,55 +88,52 @@ from flet import (
     icons
 )
 
-from flet.matplotlib_chart import MatplotlibChart
-
 import numpy as np
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-from sympy import Symbol, nsolve, sqrt
-from cycler import cycler
+
+from cache import ResultCache, chave
+from confiabilidade import LogNormal, Normal, monte_carlo
+from dano import CORRECAO_MEDIA, KSI, dano_miner, ler_espectro
+from decimacao import decimar
+from estatica import IncrementalStatics, ShaftModel, envoltoria_carga_movel, varredura_fases
+from fadiga import (
+    CRITERIOS,
+    DIAMETROS_PADRAO,
+    FATOR_TAMANHO,
+    LISTA_MATERIAIS,
+    DiameterProfile,
+    FatigueModel,
+    coeficientes_seguranca,
+    diametros,
+    escalonar,
+    perfil_cs,
+    perfil_diametro,
+)
+from otimizacao import otimizar_apoios
 
 
-# Parâmetros dos gráficos
-mpl.use("svg")
-mpl.rcParams["figure.dpi"] = 100
-mpl.rcParams["font.weight"] = "bold"
-mpl.rcParams["font.size"] = 10
-mpl.rcParams["axes.prop_cycle"] = cycler(color=["#21918c"])
-mpl.rcParams["axes.titlesize"] = 20
-mpl.rcParams["axes.labelpad"] = 6
-mpl.rcParams["lines.linewidth"] = 3
-mpl.rcParams["ytick.left"] = False
+# Matplotlib só é importado no primeiro gráfico: é a maior parte do tempo de importação
+plt = None
 
+# Diagramas de momento e torque: "flet" (LineChart nativo) ou "matplotlib" (SVG)
+BACKEND_GRAFICOS = "flet"
+COR_GRAFICO = "#21918c"
+COR_CURSOR = "#fdbb2d"
 
-PI = np.pi
-LISTA_MATERIAIS = {
-    # "Material": [Tensão Ruptura (MPA), Tensão Ruptura (ksi), Tensão Escoamento(MPa), Tensão Escoamento(ksi)]
-    "SAE 1006 LQ": [300, 43, 170, 24],
-    "SAE 1006 LF": [330, 48, 280, 41],
-    "SAE 1010 LQ": [320, 47, 180, 26],
-    "SAE 1010 LF": [370, 53, 300, 44],
-    "SAE 1015 LQ": [340, 50, 190, 27.5],
-    "SAE 1015 LF": [390, 56, 320, 47],
-    "SAE 1018 LQ": [400, 58, 220, 32],
-    "SAE 1018 LF": [440, 64, 370, 54],
-    "SAE 1020 LQ": [380, 55, 210, 30],
-    "SAE 1020 LF": [470, 68, 390, 57],
-    "SAE 1030 LQ": [470, 68, 260, 37.5],
-    "SAE 1030 LF": [520, 76, 440, 64],
-    "SAE 1035 LQ": [500, 72, 270, 39.5],
-    "SAE 1035 LF": [550, 80, 460, 67],
-    "SAE 1040 LQ": [520, 76, 290, 42],
-    "SAE 1040 LF": [590, 85, 490, 71],
-    "SAE 1045 LQ": [570, 82, 310, 45],
-    "SAE 1045 LF": [630, 91, 530, 77],
-    "SAE 1050 LQ": [620, 90, 340, 49.5],
-    "SAE 1050 LF": [690, 90, 580, 84],
-    "SAE 1060 LQ": [680, 98, 370, 54],
-    "SAE 1080 LQ": [770, 112, 420, 61.5],
-    "SAE 1095 LQ": [830, 120, 460, 66],
-}
+# Máximo de pontos por curva enviados aos gráficos, independente da resolução do cálculo
+PONTOS_GRAFICO = 400
+
+# Espectro de carga: arquivo escolhido pelo usuário (no modo web, enviado para esta pasta
+# do servidor e apagado depois de lido). Um espectro tem poucos kB; nada além do limite
+# é lido, nem no desktop
+PASTA_UPLOADS = os.path.join(tempfile.gettempdir(), "7J-uploads")
+TAMANHO_MAX_ESPECTRO = 1024 * 1024
 
+IMPORTADO = perf_counter()
+
+registro = logging.getLogger(__name__)
+
+
+PI = np.pi
 
 
 class TextBold(Text):
@@ -151,18 +171,230 @@ class Units:
         self.fator_cs = 1_000_000
 
 
+class SessionState:
+    # Dados do eixo de uma sessão. Cada página (usuário, no modo web) tem o seu, em
+    # vez de variáveis globais compartilhadas entre as sessões.
+    def __init__(self) -> None:
+        self.comp_eixo = 0.0
+        self.qt_forces = 0
+        self.pos_apoio = [0.0, 0.0]
+        self.f = np.zeros((0, 3))
+        self.r = np.zeros((0, 3))
+        self.torsor = np.zeros(0)
+        # Contribuições de cada força, para editar uma força sem recalcular as outras
+        self.estatica = None
+        # Último resultado da análise estática, usado pelo perfil de CS da aba de fadiga
+        self.resultado_estatico = None
+        # Rastreia a quantidade de vezes que o botão de adicionar força foi apertado
+        self.contador = 1
+        # Conteúdo do CSV do espectro de carga e, durante um envio (modo web), o nome
+        # do arquivo na pasta de uploads
+        self.espectro = None
+        self.envio_espectro = None
+
+
+class FatigueInputs:
+    # Cópia dos campos da aba de fadiga feita no evento: o cálculo na thread de trabalho
+    # usa só estes valores, nunca os controles, que podem mudar enquanto ele roda
+    def __init__(self, **valores) -> None:
+        self.__dict__.update(valores)
+
+
+class LatestRequest:
+    # Cálculos pesados de uma sessão, executados fora do evento da interface. Para cada
+    # nome vale só o pedido mais recente: um pedido novo cancela o anterior.
+    def __init__(self, page) -> None:
+        self.page = page
+        self.trava = threading.Lock()
+        self.pedidos = {}
+
+    def executar(self, nome, etapas, *args, falha=None):
+        # etapas(*args, cancelar) é um gerador que calcula na thread de trabalho e entrega
+        # (yield) funções que aplicam cada parte do resultado aos controles, na ordem em
+        # que ficam prontas (números antes dos gráficos). Se o cálculo falhar,
+        # falha(mensagem) devolve a função que mostra o erro nos mesmos controles.
+        cancelar = threading.Event()
+        with self.trava:
+            if nome in self.pedidos:
+                self.pedidos[nome].set()
+            self.pedidos[nome] = cancelar
+        self.page.run_thread(self._rodar, etapas(*args, cancelar), cancelar, falha)
+
+    def descartar_todos(self):
+        with self.trava:
+            for cancelar in self.pedidos.values():
+                cancelar.set()
+            self.pedidos.clear()
+
+    def _rodar(self, gerador, cancelar, falha):
+        try:
+            for aplicar in gerador:
+                # Verificação e aplicação sob a trava: um pedido substituído nunca
+                # altera os controles depois que o novo foi registrado
+                with self.trava:
+                    if cancelar.is_set():
+                        gerador.close()
+                        return
+                    aplicar()
+                self.page.update()
+        except Exception as erro:
+            mensagem = f"ERRO! {type(erro).__name__}: {erro}"
+            registro.exception("Falha no cálculo em segundo plano")
+            if falha is None:
+                return
+            with self.trava:
+                if cancelar.is_set():
+                    return
+                falha(mensagem)()
+            self.page.update()
+
+
+class FrameThrottle:
+    # Limita funcao à taxa de quadros da tela: chamadas dentro do mesmo quadro são
+    # agrupadas e só o último valor é aplicado, no fim do quadro
+    def __init__(self, funcao, intervalo=1 / 60) -> None:
+        self.funcao = funcao
+        self.intervalo = intervalo
+        self.trava = threading.Lock()
+        self.valor = None
+        self.agendado = False
+        self.ultimo = 0.0
+
+    def __call__(self, valor):
+        with self.trava:
+            self.valor = valor
+            if self.agendado:
+                return
+            espera = self.ultimo + self.intervalo - perf_counter()
+            if espera > 0:
+                self.agendado = True
+                threading.Timer(espera, self._disparar).start()
+                return
+            self.ultimo = perf_counter()
+        self.funcao(valor)
+
+    def _disparar(self):
+        with self.trava:
+            valor = self.valor
+            self.agendado = False
+            self.ultimo = perf_counter()
+        self.funcao(valor)
+
+
+class UpdateBatch:
+    # Validadores e campos do formulário marcam só os controles que alteraram; o envio
+    # é feito uma vez por ciclo do laço de eventos, com page.update(*controles), em vez
+    # de comparar a página inteira (inclusive a aba de resultados) a cada tecla
+    def __init__(self, page) -> None:
+        self.page = page
+        self.trava = threading.Lock()
+        self.sujos = {}
+        self.agendado = False
+
+    def marcar(self, *controles):
+        with self.trava:
+            for controle in controles:
+                self.sujos[id(controle)] = controle
+            if self.agendado:
+                return
+            self.agendado = True
+        self.page.run_thread(self.enviar)
+
+    def enviar(self):
+        with self.trava:
+            controles = [c for c in self.sujos.values() if c.page is not None]
+            self.sujos.clear()
+            self.agendado = False
+        if controles:
+            self.page.update(*controles)
+
+
 class CleanErrorText:
     def limpar(self, *args: TextField):
         for _ in args:
             _.error_text = ""
 
 
+def pyplot():
+    global plt
+    if plt is None:
+        import matplotlib as mpl
+        import matplotlib.pyplot
+        from cycler import cycler
+
+        # Parâmetros dos gráficos
+        mpl.use("svg")
+        mpl.rcParams["figure.dpi"] = 100
+        mpl.rcParams["font.weight"] = "bold"
+        mpl.rcParams["font.size"] = 10
+        mpl.rcParams["axes.prop_cycle"] = cycler(color=["#21918c"])
+        mpl.rcParams["axes.titlesize"] = 20
+        mpl.rcParams["axes.labelpad"] = 6
+        mpl.rcParams["lines.linewidth"] = 3
+        mpl.rcParams["ytick.left"] = False
+
+        plt = matplotlib.pyplot
+    return plt
+
+
+# SVGs já renderizados (LRU), indexados por um hash da função de plotagem e dos dados
+CACHE_GRAFICOS = OrderedDict()
+MAX_GRAFICOS = 32
+_trava_graficos = threading.Lock()
+
+# Resultados das análises de fadiga, compartilhados pelas sessões: entradas iguais
+# (no mesmo sistema de unidades) dão resultados iguais
+CACHE_RESULTADOS = ResultCache(maximo=256)
+
+
+def chave_grafico(funcao, args):
+    h = hashlib.blake2b(funcao.__name__.encode(), digest_size=16)
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            arg = np.ascontiguousarray(arg)
+            h.update(f"{arg.dtype}{arg.shape}".encode())
+            h.update(arg.tobytes())
+        else:
+            # Pelo conteúdo, nunca pelo repr (que pode incluir o endereço do objeto);
+            # tipos sem forma canônica levantam TypeError
+            h.update(chave(arg).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def Grafico(funcao, *args, **kwargs):
+    # Gráfico como imagem SVG estática: a figura é renderizada uma única vez e fechada
+    # logo em seguida (o MatplotlibChart a mantinha aberta e renderizava de novo a cada
+    # page.update). Diagramas idênticos reaproveitam o SVG do cache sem nova plotagem.
+    chave = chave_grafico(funcao, args)
+    with _trava_graficos:
+        if chave in CACHE_GRAFICOS:
+            CACHE_GRAFICOS.move_to_end(chave)
+        else:
+            fig = funcao(*args)
+            s = io.StringIO()
+            fig.savefig(s, format="svg")
+            largura, altura = fig.get_size_inches()
+            pyplot().close(fig)
+
+            CACHE_GRAFICOS[chave] = (s.getvalue(), largura / altura)
+            if len(CACHE_GRAFICOS) > MAX_GRAFICOS:
+                CACHE_GRAFICOS.popitem(last=False)
+        svg, proporcao = CACHE_GRAFICOS[chave]
+
+    return Container(
+        content=Image(src=svg, fit=ImageFit.FILL, aspect_ratio=proporcao),
+        alignment=alignment.center,
+        **kwargs,
+    )
+
+
 def Plot(x, momento, unidade_comprimento, unidade_force, title):
-    fig, ax = plt.subplots()
+    fig, ax = pyplot().subplots()
     ax.plot(x, momento)
     ax.fill_between(x, momento, alpha=0.2)
     ax.invert_yaxis()
-    ax.set_xlim(0, comp_eixo)
+    ax.set_xlim(0, x[-1])
     ax.set_xlabel(unidade_comprimento)
     ax.set_ylabel(unidade_force + chr(183) + unidade_comprimento)
     ax.set_title(title)
@@ -170,7 +402,143 @@ def Plot(x, momento, unidade_comprimento, unidade_force, title):
     return fig
 
 
+def marcas(minimo, maximo, n=5):
+    # Valores "redondos" (1, 2 ou 5 x 10^k) cobrindo o intervalo
+    amplitude = maximo - minimo
+    if amplitude <= 0:
+        return np.array([minimo])
+    bruto = amplitude / n
+    potencia = 10 ** np.floor(np.log10(bruto))
+    passo = potencia * min((1, 2, 5, 10), key=lambda m: abs(m * potencia - bruto))
+    return np.arange(np.ceil(minimo / passo), np.floor(maximo / passo) + 1) * passo
+
+
+class NativeChart(Column):
+    # Mesmo gráfico do Plot() com o LineChart do Flet: só os vértices do diagrama vão
+    # para o cliente. O eixo y é invertido negando os dados e os rótulos.
+    def __init__(self, x, momento, unidade_comprimento, unidade_force, title, **kwargs):
+        super().__init__(spacing=0, horizontal_alignment=CrossAxisAlignment.CENTER, **kwargs)
+        x = np.asarray(x, dtype=float)
+        y = -np.asarray(momento, dtype=float)
+        minimo, maximo = min(float(np.min(y)), 0.0), max(float(np.max(y)), 0.0)
+        folga = 0.05 * (maximo - minimo) or 1.0
+
+        self.cursor_ponto = LineChartDataPoint(float(x[0]), float(y[0]))
+        self.controls = [
+            Text(title, size=16, weight=FontWeight.BOLD, text_align=TextAlign.CENTER),
+            LineChart(
+                data_series=[
+                    LineChartData(
+                        data_points=[LineChartDataPoint(float(a), float(b)) for a, b in zip(x, y)],
+                        color=COR_GRAFICO,
+                        stroke_width=3,
+                        below_line_bgcolor=colors.with_opacity(0.2, COR_GRAFICO),
+                        below_line_cutoff_y=0.0,
+                        above_line_bgcolor=colors.with_opacity(0.2, COR_GRAFICO),
+                        above_line_cutoff_y=0.0,
+                    ),
+                    LineChartData(
+                        data_points=[self.cursor_ponto],
+                        stroke_width=0,
+                        point=ChartCirclePoint(color=COR_CURSOR, radius=6),
+                    ),
+                ],
+                left_axis=ChartAxis(
+                    title=Text(unidade_force + chr(183) + unidade_comprimento, weight=FontWeight.BOLD),
+                    labels=[
+                        ChartAxisLabel(value=float(v), label=Text(f"{-v:g}", size=10))
+                        for v in marcas(minimo, maximo)
+                    ],
+                    labels_size=50,
+                ),
+                bottom_axis=ChartAxis(
+                    title=Text(unidade_comprimento, weight=FontWeight.BOLD),
+                    labels=[
+                        ChartAxisLabel(value=float(v), label=Text(f"{v:g}", size=10))
+                        for v in marcas(float(x[0]), float(x[-1]))
+                    ],
+                    labels_size=30,
+                ),
+                horizontal_grid_lines=ChartGridLines(color=colors.with_opacity(0.1, colors.BLACK), width=1),
+                min_x=float(x[0]),
+                max_x=float(x[-1]),
+                min_y=minimo - folga,
+                max_y=maximo + folga,
+                aspect_ratio=4 / 3,
+            ),
+        ]
+
+    def cursor(self, x, momento):
+        # Só o ponto do cursor muda: a atualização não reenvia a curva
+        self.cursor_ponto.x = float(x)
+        self.cursor_ponto.y = -float(momento)
+
+
+def PlotControle(x, momento, unidade_comprimento, unidade_force, title, **kwargs):
+    i = decimar(x, momento, PONTOS_GRAFICO)
+    x, momento = np.asarray(x)[i], np.asarray(momento)[i]
+    if BACKEND_GRAFICOS == "flet":
+        return NativeChart(x, momento, unidade_comprimento, unidade_force, title, **kwargs)
+    return Grafico(Plot, x, momento, unidade_comprimento, unidade_force, title, **kwargs)
+
+
+def PlotCS(x, cs, x_critico, cs_min, unidade_comprimento, title):
+    i = decimar(x, cs, PONTOS_GRAFICO)
+    x, cs = x[i], cs[i]
+    cs = np.where(np.isfinite(cs), cs, np.nan)
+    fig, ax = pyplot().subplots()
+    ax.plot(x, cs)
+    ax.fill_between(x, cs, alpha=0.2)
+    ax.plot([x_critico], [cs_min], "o", color="#fdbb2d")
+    ax.set_xlim(0, x[-1])
+    ax.set_ylim(0, min(np.nanmax(cs), 5 * cs_min))
+    ax.set_xlabel(unidade_comprimento)
+    ax.set_ylabel("CS")
+    ax.set_title(title)
+    ax.set_frame_on(False)
+    return fig
+
+
+def PlotDiametro(x, d_req, d_escalonado, unidade_comprimento, title):
+    # Os ressaltos do eixo escalonado também são obrigatórios
+    ressaltos = np.flatnonzero(np.diff(d_escalonado))
+    i = decimar(x, d_req, PONTOS_GRAFICO, np.concatenate((ressaltos, ressaltos + 1)))
+    x, d_req, d_escalonado = x[i], d_req[i], d_escalonado[i]
+    fig, ax = pyplot().subplots()
+    ax.plot(x, d_req)
+    ax.fill_between(x, d_req, alpha=0.2)
+    ax.plot(x, d_escalonado, color="#fdbb2d", linewidth=2)
+    ax.set_xlim(0, x[-1])
+    ax.set_ylim(0, 1.1 * np.nanmax(d_escalonado))
+    ax.set_xlabel(unidade_comprimento)
+    ax.set_ylabel(unidade_comprimento)
+    ax.set_title(title)
+    ax.set_frame_on(False)
+    return fig
+
+
+def PlotEnvoltoria(x, Mr_atual, Mr_max, Mh_min, Mh_max, Mv_min, Mv_max, unidade_comprimento, unidade_momento, title):
+    # Faixas de Mh e Mv e o máximo do momento resultante sobre todas as posições,
+    # junto com o momento resultante da configuração atual
+    curvas = (Mr_atual, Mr_max, Mh_min, Mh_max, Mv_min, Mv_max)
+    i = np.unique(np.concatenate([decimar(x, y, PONTOS_GRAFICO // 2) for y in curvas]))
+    x, Mr_atual = x[i], Mr_atual[i]
+    fig, ax = pyplot().subplots()
+    ax.fill_between(x, Mh_min[i], Mh_max[i], alpha=0.2, label="Mh")
+    ax.fill_between(x, Mv_min[i], Mv_max[i], alpha=0.2, color="#22c1c3", label="Mv")
+    ax.plot(x, Mr_max[i], color="#fdbb2d", label="Resultante (máx.)")
+    ax.plot(x, Mr_atual, label="Resultante (atual)")
+    ax.set_xlim(0, x[-1])
+    ax.set_xlabel(unidade_comprimento)
+    ax.set_ylabel(unidade_momento)
+    ax.set_title(title)
+    ax.legend(fontsize=8, frameon=False)
+    ax.set_frame_on(False)
+    return fig
+
+
 def main(page: Page):
+    construcao = perf_counter()
     page.theme = Theme(color_scheme_seed="teal")
     page.theme_mode = ThemeMode.LIGHT
     page.window_width = 400
@@ -180,6 +548,7 @@ def main(page: Page):
 
 
     TEXTFIELD_HEIGHT = 65
+    LARGURA_FORCA = 75
     DIVIDER = Container(height=25)
 
     GRADIENTE = Container(
@@ -197,25 +566,24 @@ def main(page: Page):
         NOME_MATERIAIS.append(dropdown.Option(j))
 
     units = Units()
+    estado = SessionState()
+    pedidos = LatestRequest(page)
+    atualizacoes = UpdateBatch(page)
     clean_error_text = CleanErrorText()
 
 
     def inicio(ce, qf, ap1, ap2):
-        global comp_eixo, qt_forces, pos_apoio, d, f, r, torsor
-
-        comp_eixo = float(ce)
-        qt_forces = int(qf)
+        estado.comp_eixo = float(ce)
+        estado.qt_forces = int(qf)
         apoio_1 = float(ap1)
         apoio_2 = float(ap2)
-        pos_apoio = [apoio_1, apoio_2]
+        estado.pos_apoio = [apoio_1, apoio_2]
 
-        d = []
-        d.append(apoio_1)
-        d.append(apoio_2)
-        f = np.zeros((qt_forces, 3))
-        r = np.zeros((qt_forces, 3))
+        estado.estatica = IncrementalStatics(estado.comp_eixo, estado.pos_apoio)
+        estado.f = estado.estatica.f
+        estado.r = estado.estatica.r
 
-        torsor = np.zeros(qt_forces)
+        estado.torsor = np.zeros(estado.qt_forces)
 
     def cargas(*args):
         fy = float(args[0])
@@ -223,111 +591,153 @@ def main(page: Page):
         rx = float(args[2])
         ry = float(args[3])
         rz = float(args[4])
-        cont = int(args[5])
-
-        # f[cont,0] = 0.
-        f[cont, 1] = fy
-        f[cont, 2] = fz
-        r[cont, 0] = rx
-        r[cont, 1] = ry
-        r[cont, 2] = rz
-        d.append(r[cont, 0])
-
-    def momento_fletor():
-        r[:, 0] -= pos_apoio[0]
-        Ma = np.sum(np.cross(r, f), axis=0)
-        d_apoio = pos_apoio[1] - pos_apoio[0]
-
-        Bx = 0.0
-        By = -Ma[2] / d_apoio
-        Bz = Ma[1] / d_apoio
-
-        Ax = 0.0
-        Ay = -By
-        Az = -Bz
-        for i in range(qt_forces):
-            Ay -= f[i, 1]
-            Az -= f[i, 2]
-
-        A = np.array([[Ax, Ay, Az]])
-        B = np.array([[Bx, By, Bz]])
-
-        f_ext = f
-        f_ext = np.concatenate((B, f_ext))
-        f_ext = np.concatenate((A, f_ext))
-
-        # Discretização do eixo e inicialização das forças e momentos
-        n = 1000
-        x = np.linspace(0, comp_eixo, num=n)
-        Mh, Mv, Mt = np.zeros(n), np.zeros(n), np.zeros(n)
-        fy, fz = 0.0, 0.0
-
-        for i in range(qt_forces + 2):
-            fz = f_ext[i, 2]
-            fy = f_ext[i, 1]
-
-            x_ = (x >= d[i]) * (x - d[i])
-            Mh -= fz * x_
-            Mv += fy * x_
-
-        for i in range(qt_forces):
-            idx_ = np.where(x >= (r[i, 0] + pos_apoio[0]))[0][0]
-            Mt[idx_:] += r[i, 1] * f[i, 2] - r[i, 2] * f[i, 1]
-
-        Mh_max = np.max(np.abs(Mh))
-        Mv_max = np.max(np.abs(Mv))
-
-        # Correção dos Extremos dos Momentos
-        Mh[0], Mh[-1] = 0.0, 0.0
-        Mv[0], Mv[-1] = 0.0, 0.0
-        Mt[0], Mt[-1] = 0.0, 0.0
-
-        # Momento Horizontal
-        fig1 = Plot(x, Mh, units.unidade_comprimento, units.unidade_force, "Momento Fletor - Plano Horizontal (X-Z)")
-
-        # Momento Vertical
-        fig2 = Plot(x, Mv, units.unidade_comprimento, units.unidade_force, "Momento Fletor - Plano Vertical (X-Y)" )
-
-        # Momento Torsor
-        fig3 = Plot(x, Mt, units.unidade_comprimento, units.unidade_force, "Diagrama do Torque" )
-
-
-        # Inicialização do slider
-        divisions_slider = int(100)
-        id0 = int(n / 2)
-        mh_texto = TextBold(
-            f"{Mh[id0]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-        mv_texto = TextBold(
-            f"{Mv[id0]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-        mr_texto = TextBold(
-            f"{np.sqrt(Mh[id0]**2 + Mv[id0]**2):.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-        mt_texto = TextBold(
-            f"{Mt[id0]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
+
+        estado.estatica.adicionar([0., fy, fz], [rx, ry, rz])
+        estado.f = estado.estatica.f
+        estado.r = estado.estatica.r
+
+    def reanalisar():
+        # Depois de editar a lista de forças: os diagramas são remontados a partir dos
+        # totais do IncrementalStatics, sem recalcular as forças que não mudaram
+        estado.f = estado.estatica.f
+        estado.r = estado.estatica.r
+        estado.qt_forces = estado.f.shape[0]
+        pedidos.executar(
+            "estatica", analise_estatica, estado.estatica.resultado(), estado.f, estado.r, estado.estatica.ids,
+            falha=falha_estatica,
+        )
+
+    def mudar_apoios(a, b):
+        # Novo solver com as mesmas forças; os campos de dados iniciais acompanham
+        estado.pos_apoio = [a, b]
+        estatica = IncrementalStatics(estado.comp_eixo, estado.pos_apoio)
+        for f_i, r_i in zip(estado.f, estado.r):
+            estatica.adicionar(f_i, r_i)
+        estado.estatica = estatica
+        apoio_1.value, apoio_2.value = f"{a:.4g}", f"{b:.4g}"
+        atualizacoes.marcar(apoio_1, apoio_2)
+        reanalisar()
+
+    def ler_forca(campos):
+        fy, fz, rx, ry, rz = (float(str(c.value)) for c in campos)
+        if rx < 0.0 or rx > estado.comp_eixo:
+            raise ValueError
+        return [0., fy, fz], [rx, ry, rz]
+
+    def editar_forca(e):
+        # Pelo identificador da força: a linha pode ser de uma lista já desatualizada
+        ident, campos = e.control.data
+        i = estado.estatica.indice(ident)
+        if i is None:
+            return
+        try:
+            f_i, r_i = ler_forca(campos)
+        except:
+            e.control.error_text = "Inválido"
+            atualizacoes.marcar(e.control)
+            return
+
+        e.control.error_text = ""
+        if np.array_equal(f_i, estado.f[i]) and np.array_equal(r_i, estado.r[i]):
+            atualizacoes.marcar(e.control)
+            return
+        estado.estatica.editar(i, f_i, r_i)
+        reanalisar()
+
+    def excluir_forca(e):
+        # Um segundo clique antes de a lista ser refeita não encontra mais a força
+        i = estado.estatica.indice(e.control.data)
+        if i is None:
+            return
+        estado.estatica.remover(i)
+        reanalisar()
+
+    def nova_forca(e):
+        campos = e.control.data
+        try:
+            f_i, r_i = ler_forca(campos)
+        except:
+            for c in campos:
+                c.error_text = "Inválido"
+            atualizacoes.marcar(*campos)
+            return
+        estado.estatica.adicionar(f_i, r_i)
+        reanalisar()
+
+    def momento_fletor(resultado, f, r, ids):
+        # Retorna a coluna de resultados e a função que desenha os gráficos, chamada
+        # depois que os números já estão na tela
+        Mh_max, Mv_max = resultado.Mh_max, resultado.Mv_max
+        f_ext = np.vstack((resultado.A, resultado.B, f))
+
+        # Lugares dos gráficos enquanto eles são desenhados
+        grafico_mh = Container(ProgressRing(), col={"md": 6}, alignment=alignment.center, height=0.35 * page.height)
+        grafico_mv = Container(ProgressRing(), col={"md": 6}, alignment=alignment.center, height=0.35 * page.height)
+        grafico_mt = Container(ProgressRing(), col={"md": 6}, alignment=alignment.center, height=0.35 * page.height, expand=True)
+
+        def desenhar():
+            # Os diagramas são lineares por partes: os vértices bastam para os gráficos
+            graficos = (
+                # Momento Horizontal
+                PlotControle(resultado.Mh.xk, resultado.Mh.yk, units.unidade_comprimento, units.unidade_force, "Momento Fletor - Plano Horizontal (X-Z)"),
+                # Momento Vertical
+                PlotControle(resultado.Mv.xk, resultado.Mv.yk, units.unidade_comprimento, units.unidade_force, "Momento Fletor - Plano Vertical (X-Y)"),
+                # Momento Torsor
+                PlotControle(resultado.Mt.xk, resultado.Mt.yk, units.unidade_comprimento, units.unidade_force, "Diagrama do Torque"),
+            )
+
+            def aplicar():
+                posicao = float(str(slider.value))
+                for caixa, grafico, momento in zip((grafico_mh, grafico_mv, grafico_mt), graficos, resultado.avaliar(posicao)):
+                    caixa.content = grafico
+                    caixa.height = None
+                    if isinstance(grafico, NativeChart):
+                        grafico.cursor(posicao, momento)
+            return aplicar
+
+        # Inicialização do slider: valores exatos dos diagramas na posição escolhida.
+        # Sem divisões o slider é contínuo e sondar recebe a posição exata.
+        comprimento = float(resultado.Mh.xk[-1])
+        unidade_momento = units.unidade_force + chr(183) + units.unidade_comprimento
+        mh_texto = TextBold("")
+        mv_texto = TextBold("")
+        mr_texto = TextBold("")
+        mt_texto = TextBold("")
+
+        def mostrar_posicao(posicao):
+            Mh, Mv, Mr, Mt = resultado.sondar(posicao)
+            texto.value = f"Posição no eixo ({posicao:.3f} {units.unidade_comprimento}):"
+            mh_texto.value = f"{Mh:.2f} {unidade_momento}"
+            mv_texto.value = f"{Mv:.2f} {unidade_momento}"
+            mr_texto.value = f"{Mr:.2f} {unidade_momento}"
+            mt_texto.value = f"{Mt:.2f} {unidade_momento}"
+
+            # Só os textos e os pontos dos cursores são enviados
+            controles = [texto, mh_texto, mv_texto, mr_texto, mt_texto]
+            for caixa, momento in ((grafico_mh, Mh), (grafico_mv, Mv), (grafico_mt, Mt)):
+                if isinstance(caixa.content, NativeChart):
+                    caixa.content.cursor(posicao, momento)
+                    controles.append(caixa.content.cursor_ponto)
+            return controles
+
+        def enviar_posicao(posicao):
+            controles = [c for c in mostrar_posicao(posicao) if c.page is not None]
+            if controles:
+                page.update(*controles)
+
+        atualizar_posicao = FrameThrottle(enviar_posicao)
 
         def mudar_label(e):
-            texto.value = (
-                f"Posição no eixo ({slider.value:.3f} {units.unidade_comprimento}):")
-            id = int((float(str(slider.value)) / x[-1]) * 1000) - 1
-            mh_texto.value = (
-                f"{Mh[id]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-            mv_texto.value = (
-                f"{Mv[id]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-            mr_texto.value = f"{np.sqrt(Mh[id]**2 + Mv[id]**2):.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}"
-            mt_texto.value = (
-                f"{Mt[id]:.2f} {units.unidade_force + chr(183) + units.unidade_comprimento}")
-            page.update()
+            atualizar_posicao(float(str(slider.value)))
 
         lv = ListView(
             col={"sm": 4},
             controls=[
                 Row(
                     [
-                        Text(),
-                        TextBold("Fy", 16),
-                        TextBold("Fz", 16),
-                        TextBold("rx", 16),
-                        TextBold("ry", 16),
-                        TextBold("rz", 16),
+                        Container(width=30),
+                        *[Container(TextBold(nome, 16), width=LARGURA_FORCA) for nome in ("Fy", "Fz", "rx", "ry", "rz")],
+                        Container(width=40),
                     ],
                     alignment=MainAxisAlignment.SPACE_BETWEEN,
                 )
@@ -337,17 +747,25 @@ def main(page: Page):
             divider_thickness=1,
         )
 
-        for i in range(qt_forces):
+        # Cada força pode ser editada (ao sair do campo) ou removida; a última linha
+        # adiciona uma força nova
+        for i in range(f.shape[0] + 1):
+            nova = i == f.shape[0]
+            valores = ("",) * 5 if nova else (f_ext[i+2][1], f_ext[i+2][2], r[i, 0], r[i, 1], r[i, 2])
+            campos = [
+                TextField(value=f"{v}", width=LARGURA_FORCA, dense=True, on_blur=None if nova else editar_forca)
+                for v in valores
+            ]
+            for c in campos:
+                c.data = (None if nova else ids[i], campos)
+
+            if nova:
+                botao = IconButton(icon=icons.ADD, tooltip="Nova Força", on_click=nova_forca, data=campos)
+            else:
+                botao = IconButton(icon=icons.DELETE_OUTLINE, tooltip="Remover Força", on_click=excluir_forca, data=ids[i])
             lv.controls.append(
                 Row(
-                    [
-                        TextNormal(f"{i+1})"),
-                        TextNormal(f"{f_ext[i+2][1]}"),
-                        TextNormal(f"{f_ext[i+2][2]}"),
-                        TextNormal(f"{r[i,0] + pos_apoio[0]}"),
-                        TextNormal(f"{r[i,1]}"),
-                        TextNormal(f"{r[i,2]}"),
-                    ],
+                    [Container(TextNormal("+" if nova else f"{i+1})"), width=30), *campos, botao],
                     alignment=MainAxisAlignment.SPACE_BETWEEN,
                 )
             )
@@ -405,7 +823,6 @@ def main(page: Page):
 
         texto = Text(
             col={"sm": 6},
-            value=f"Posição no eixo ({x[id0]:.2f} {units.unidade_comprimento}):",
             weight=FontWeight.BOLD,
             size=18,
         )
@@ -413,12 +830,12 @@ def main(page: Page):
             col={"sm": 6},
             active_color="#21918c",
             thumb_color="#22c1c3",
-            value=x[-1] / 2,
-            min=x[0],
-            max=x[-1],
-            divisions=divisions_slider,
+            value=comprimento / 2,
+            min=0.0,
+            max=comprimento,
             on_change=mudar_label,
         )
+        mostrar_posicao(comprimento / 2)
 
         texto_momento = ResponsiveRow(
             [
@@ -448,7 +865,7 @@ def main(page: Page):
             alignment=MainAxisAlignment.SPACE_EVENLY,
         )
 
-        return Column(
+        coluna = Column(
             controls=[
                 ResponsiveRow(
                     [
@@ -514,14 +931,14 @@ def main(page: Page):
                 Container(
                     content=ResponsiveRow(
                         [
-                            MatplotlibChart(fig1, col={"md": 6}),
-                            MatplotlibChart(fig2, col={"md": 6}),
+                            grafico_mh,
+                            grafico_mv,
                         ]
                     )
                 ),
                 ResponsiveRow(
                     controls=[
-                        MatplotlibChart(fig3, col={"md": 6}, expand=True),
+                        grafico_mt,
                         Card(
                             col={"md": 6},
                             elevation=3,
@@ -550,6 +967,296 @@ def main(page: Page):
             alignment=MainAxisAlignment.CENTER,
             scroll=ScrollMode.AUTO,
         )
+        coluna.controls.append(carga_movel(resultado, f, r))
+        coluna.controls.append(cargas_rotativas(resultado, f, r))
+        coluna.controls.append(posicao_apoios(resultado, f, r))
+        return coluna, desenhar
+
+    def carga_movel(resultado, f, r):
+        # Envoltórias com uma ou mais forças (que andam juntas) percorrendo o eixo
+        unidade_momento = units.unidade_force + chr(183) + units.unidade_comprimento
+        forcas_moveis = TextField(label="Forças móveis (ex.: 1;3)", value="1", dense=True, width=180)
+        inicio_movel = TextField(label="Início (1ª força móvel)", value="0", dense=True, width=180, on_blur=verifica_numero)
+        fim_movel = TextField(label="Fim (1ª força móvel)", value=f"{estado.comp_eixo}", dense=True, width=180, on_blur=verifica_numero)
+        n_posicoes = TextField(label="Posições", value="200", dense=True, width=100, on_blur=verifica_numero_inteiro)
+        texto_envoltoria = TextNormal("")
+        grafico_envoltoria = Container()
+
+        def envoltoria(modelo, moveis, posicoes, cancelar):
+            try:
+                env = envoltoria_carga_movel(modelo, moveis, posicoes)
+            except ValueError as erro:
+                mensagem = str(erro)
+                env = None
+            else:
+                mensagem = (
+                    f"Maior momento resultante: {env.Mr_critico:.2f} {unidade_momento} com a 1ª força móvel "
+                    f"em x = {env.posicao_critica:.3f} {units.unidade_comprimento}. Reações (mín./máx.): "
+                    f"Ay {env.A_min[1]:.2f}/{env.A_max[1]:.2f}, Az {env.A_min[2]:.2f}/{env.A_max[2]:.2f}, "
+                    f"By {env.B_min[1]:.2f}/{env.B_max[1]:.2f}, Bz {env.B_min[2]:.2f}/{env.B_max[2]:.2f} {units.unidade_force}"
+                )
+
+            def mostrar():
+                texto_envoltoria.value = mensagem
+                grafico_envoltoria.content = None
+            yield mostrar
+
+            if env is None or cancelar.is_set():
+                return
+            grafico = Grafico(
+                PlotEnvoltoria, env.x, resultado.sondar(env.x)[2], env.Mr_max,
+                env.Mh_min, env.Mh_max, env.Mv_min, env.Mv_max,
+                units.unidade_comprimento, unidade_momento, "Envoltória - Carga Móvel",
+            )
+
+            def mostrar_grafico():
+                grafico_envoltoria.content = grafico
+            yield mostrar_grafico
+
+        def falha_envoltoria(mensagem):
+            def aplicar():
+                texto_envoltoria.value = mensagem
+                grafico_envoltoria.content = None
+            return aplicar
+
+        def calcular_envoltoria(e):
+            try:
+                moveis = [int(v) - 1 for v in str(forcas_moveis.value).split(";") if v.strip() != ""]
+                if not moveis or min(moveis) < 0 or max(moveis) >= f.shape[0]:
+                    raise ValueError
+                posicoes = np.linspace(
+                    float(str(inicio_movel.value)), float(str(fim_movel.value)), int(str(n_posicoes.value))
+                )
+            except:
+                texto_envoltoria.value = "ERRO!"
+                atualizacoes.marcar(texto_envoltoria)
+                return
+            modelo = ShaftModel(estado.comp_eixo, estado.pos_apoio, f, r)
+            pedidos.executar("envoltoria", envoltoria, modelo, moveis, posicoes, falha=falha_envoltoria)
+
+        return Card(
+            elevation=3,
+            margin=5,
+            content=Container(
+                margin=10,
+                content=Column(
+                    [
+                        CardTitle("Carga Móvel"),
+                        Row(
+                            [forcas_moveis, inicio_movel, fim_movel, n_posicoes],
+                            wrap=True,
+                            alignment=MainAxisAlignment.CENTER,
+                        ),
+                        FilledButton(text="Calcular Envoltória", on_click=calcular_envoltoria),
+                        texto_envoltoria,
+                        grafico_envoltoria,
+                    ],
+                    horizontal_alignment=CrossAxisAlignment.CENTER,
+                ),
+            ),
+        )
+
+    def cargas_rotativas(resultado, f, r):
+        # Envoltórias com as forças de engrenagens/polias girando em fase umas com as outras
+        unidade_momento = units.unidade_force + chr(183) + units.unidade_comprimento
+        forcas_rotativas = TextField(label="Forças rotativas (ex.: 1;3)", value="1", dense=True, width=180)
+        passo_angular = TextField(label="Passo angular (°)", value="15", dense=True, width=140, on_blur=verifica_numero)
+        texto_fases = TextNormal("")
+        grafico_fases = Container()
+
+        def fases(modelo, rotativas, angulos, cancelar):
+            try:
+                varredura = varredura_fases(modelo, rotativas, angulos)
+            except ValueError as erro:
+                mensagem = str(erro)
+                varredura = None
+            else:
+                def graus(valores):
+                    return "/".join(f"{v:.0f}°" for v in valores)
+
+                mensagem = (
+                    f"Maior momento resultante: {varredura.Mr_critico:.2f} {unidade_momento} com as fases "
+                    f"{graus(varredura.fases_criticas)}. Maiores reações radiais: "
+                    f"A {varredura.Ar_max:.2f} {units.unidade_force} ({graus(varredura.fases_A)}), "
+                    f"B {varredura.Br_max:.2f} {units.unidade_force} ({graus(varredura.fases_B)})"
+                )
+
+            def mostrar():
+                texto_fases.value = mensagem
+                grafico_fases.content = None
+            yield mostrar
+
+            if varredura is None or cancelar.is_set():
+                return
+            grafico = Grafico(
+                PlotEnvoltoria, varredura.x, resultado.sondar(varredura.x)[2], varredura.Mr_max,
+                varredura.Mh_min, varredura.Mh_max, varredura.Mv_min, varredura.Mv_max,
+                units.unidade_comprimento, unidade_momento, "Envoltória - Cargas Rotativas",
+            )
+
+            def mostrar_grafico():
+                grafico_fases.content = grafico
+            yield mostrar_grafico
+
+        def falha_fases(mensagem):
+            def aplicar():
+                texto_fases.value = mensagem
+                grafico_fases.content = None
+            return aplicar
+
+        def calcular_fases(e):
+            try:
+                rotativas = [int(v) - 1 for v in str(forcas_rotativas.value).split(";") if v.strip() != ""]
+                if not rotativas or min(rotativas) < 0 or max(rotativas) >= f.shape[0]:
+                    raise ValueError
+                passo = float(str(passo_angular.value))
+                if passo <= 0.0:
+                    raise ValueError
+                angulos = np.arange(0.0, 360.0, passo)
+            except:
+                texto_fases.value = "ERRO!"
+                atualizacoes.marcar(texto_fases)
+                return
+            modelo = ShaftModel(estado.comp_eixo, estado.pos_apoio, f, r)
+            pedidos.executar("fases", fases, modelo, rotativas, angulos, falha=falha_fases)
+
+        return Card(
+            elevation=3,
+            margin=5,
+            content=Container(
+                margin=10,
+                content=Column(
+                    [
+                        CardTitle("Cargas Rotativas"),
+                        Row(
+                            [forcas_rotativas, passo_angular],
+                            wrap=True,
+                            alignment=MainAxisAlignment.CENTER,
+                        ),
+                        FilledButton(text="Calcular Fases", on_click=calcular_fases),
+                        texto_fases,
+                        grafico_fases,
+                    ],
+                    horizontal_alignment=CrossAxisAlignment.CENTER,
+                ),
+            ),
+        )
+
+    def posicao_apoios(resultado, f, r):
+        # Busca as posições dos mancais que minimizam o maior momento resultante
+        unidade_momento = units.unidade_force + chr(183) + units.unidade_comprimento
+        # Por padrão o vão não diminui: só a posição do par de apoios muda
+        vao = estado.pos_apoio[1] - estado.pos_apoio[0]
+        espacamento_min = TextField(label="Espaçamento mínimo", value=f"{vao:.4g}", dense=True, width=180, on_blur=verifica_numero)
+        espacamento_max = TextField(label="Espaçamento máximo", value=f"{estado.comp_eixo}", dense=True, width=180, on_blur=verifica_numero)
+        zonas_proibidas = TextField(label="Zonas proibidas (ex.: 2-3;7-8)", value="", dense=True, width=220)
+        texto_otimo = TextNormal("")
+        usar_otimo = FilledButton(text="Usar Estes Apoios", visible=False)
+        # Os diagramas são lineares entre os vértices: o pico atual fica em um deles
+        atual = float(np.max(resultado.sondar(np.concatenate((r[:, 0], estado.pos_apoio)))[2]))
+
+        def otimizar(modelo, espacamento, proibidas, cancelar):
+            try:
+                otimo = otimizar_apoios(modelo, espacamento, proibidas)
+            except ValueError as erro:
+                mensagem = str(erro)
+                otimo = None
+            else:
+                mensagem = (
+                    f"Apoios em A = {otimo.a:.4g} e B = {otimo.b:.4g} {units.unidade_comprimento}: maior momento "
+                    f"resultante {otimo.valor:.2f} {unidade_momento} "
+                    f"(atual: {atual:.2f} {unidade_momento})"
+                )
+
+            def mostrar():
+                texto_otimo.value = mensagem
+                usar_otimo.visible = otimo is not None
+                usar_otimo.data = None if otimo is None else (otimo.a, otimo.b)
+            yield mostrar
+
+        def falha_otimo(mensagem):
+            def aplicar():
+                texto_otimo.value = mensagem
+                usar_otimo.visible = False
+            return aplicar
+
+        def calcular_otimo(e):
+            try:
+                espacamento = (float(str(espacamento_min.value)), float(str(espacamento_max.value)))
+                proibidas = [
+                    tuple(float(v) for v in zona.split("-", 1))
+                    for zona in str(zonas_proibidas.value).split(";") if zona.strip() != ""
+                ]
+            except:
+                texto_otimo.value = "ERRO!"
+                atualizacoes.marcar(texto_otimo)
+                return
+            modelo = ShaftModel(estado.comp_eixo, estado.pos_apoio, f, r)
+            pedidos.executar("apoios", otimizar, modelo, espacamento, proibidas, falha=falha_otimo)
+
+        usar_otimo.on_click = lambda e: mudar_apoios(*e.control.data)
+
+        return Card(
+            elevation=3,
+            margin=5,
+            content=Container(
+                margin=10,
+                content=Column(
+                    [
+                        CardTitle("Posição dos Apoios"),
+                        Row(
+                            [espacamento_min, espacamento_max, zonas_proibidas],
+                            wrap=True,
+                            alignment=MainAxisAlignment.CENTER,
+                        ),
+                        FilledButton(text="Otimizar Apoios", on_click=calcular_otimo),
+                        texto_otimo,
+                        usar_otimo,
+                    ],
+                    horizontal_alignment=CrossAxisAlignment.CENTER,
+                ),
+            ),
+        )
+
+    def falha_estatica(mensagem):
+        # Sem resultado válido: a aba de resultados mostra só o erro (e o botão de remover)
+        def aplicar():
+            estado.resultado_estatico = None
+            menus.tabs.pop(0)  # type: ignore
+            menus.tabs.insert(0, Tab(  # type: ignore
+                text="Análise Estática",
+                content=Column(
+                    controls=[TextNormal(mensagem), Container(height=20), remover_forces],
+                    horizontal_alignment=CrossAxisAlignment.CENTER,
+                ),
+            ))
+        return aplicar
+
+    def analise_estatica(resultado, f, r, ids, cancelar):
+        # Reações e momentos máximos aparecem primeiro; os gráficos entram em seguida
+        coluna, desenhar = momento_fletor(resultado, f, r, ids)
+
+        def mostrar():
+            estado.resultado_estatico = resultado
+            resultados = Tab(
+                text="Análise Estática",
+                content=Column(
+                    controls=[
+                        coluna,
+                        Container(height=20),
+                        remover_forces,
+                    ],
+                    horizontal_alignment=CrossAxisAlignment.CENTER,
+                    scroll=ScrollMode.AUTO,
+                ),
+            )
+
+            menus.tabs.pop(0)  # type: ignore
+            menus.tabs.insert(0, resultados)  # type: ignore
+        yield mostrar
+
+        if not cancelar.is_set():
+            yield desenhar()
 
     def adicionar(e):
         adicionar_forces.focus()
@@ -587,9 +1294,12 @@ def main(page: Page):
             page.update()
 
     def remover(e):
+        # Nenhum cálculo em andamento (análise, envoltórias, apoios, fadiga) pode escrever
+        # nos controles removidos nem reabrir a aba de resultados
+        pedidos.descartar_todos()
         remover_forces.disabled = True
         adicionar_forces.disabled = False
-        page.count = 1  # type: ignore
+        estado.contador = 1
         botao_mais.disabled = True
 
         fy.disabled = True
@@ -610,9 +1320,6 @@ def main(page: Page):
 
         page.update()
 
-    # Rastreia a quantidade de vezes que o botão foi apertado
-    page.count = 1  # type: ignore
-
     def forces(e):
         botao_mais.focus()
         if (
@@ -623,11 +1330,11 @@ def main(page: Page):
             and rz.error_text == ""
         ):
             try:
-                cargas(fy.value, fz.value, rx.value, ry.value, rz.value, page.count - 1)  # type: ignore
-                numero_force.value = f"# {page.count+1}"  # type: ignore
-                page.count += 1  # type:ignore
+                cargas(fy.value, fz.value, rx.value, ry.value, rz.value)
+                numero_force.value = f"# {estado.contador+1}"
+                estado.contador += 1
 
-                if page.count > qt_forces:  # type:ignore
+                if estado.contador > estado.qt_forces:
                     numero_force.value = "#"
                     botao_mais.disabled = True
                     fy.disabled = True
@@ -636,22 +1343,11 @@ def main(page: Page):
                     ry.disabled = True
                     rz.disabled = True
 
-                    resultados = Tab(
-                        text="Análise Estática",
-                        content=Column(
-                            controls=[
-                                momento_fletor(),
-                                Container(height=20),
-                                remover_forces,
-                            ],
-                            horizontal_alignment=CrossAxisAlignment.CENTER,
-                            scroll=ScrollMode.AUTO,
-                        ),
+                    pedidos.executar(
+                        "estatica", analise_estatica, estado.estatica.resultado(), estado.f, estado.r, estado.estatica.ids,
+                        falha=falha_estatica,
                     )
 
-                    menus.tabs.pop(0)  # type: ignore
-                    menus.tabs.insert(0, resultados)  # type: ignore
-
             except:
                 print("Algum erro aconteceu!")
 
@@ -695,8 +1391,6 @@ def main(page: Page):
 
             card_fadiga.visible = True
 
-            x = Symbol("x")
-
             check = [
                 sigma_e.value,
                 sigma_u.value,
@@ -751,8 +1445,8 @@ def main(page: Page):
                 return
 
 
-            A = np.sqrt(4 * (Kff * Ma) ** 2 + 3 * (Kfs * Ta) ** 2)
-            B = np.sqrt(4 * (Kff * Mm) ** 2 + 3 * (Kfs * Tm) ** 2)
+            # Com kb dependente do diâmetro, Se fica sem kb e o fator entra no solver
+            kb_variavel = None
 
             if escolha_limite_fadiga.value == True:
                 try:
@@ -761,26 +1455,9 @@ def main(page: Page):
                     marin_kd = float(str(kd.value))
                     marin_ke = float(str(ke.value))
 
-                    if escolha_d_.value == True:
-                        if kb_radio.value == "1":
-                            if units.unidade_comprimento == 'm':
-                                mult = 0.592
-                                marin_kb = mult * x ** (-0.107) # type: ignore
-                            else:
-                                mult = 0.879
-                                marin_kb = mult *  x ** (-0.107)  # type: ignore
-
-
-                        elif kb_radio.value == "2":
-                            if units.unidade_comprimento == 'm':
-                                mult = 0.51
-                                marin_kb = mult * x ** (-0.157) # type: ignore
-                            else:
-                                mult = 0.91
-                                marin_kb = mult *  x ** (-0.157)  # type: ignore
-
-                        else:
-                            marin_kb = float(str(kb.value))
+                    if escolha_d_.value == True and kb_radio.value in FATOR_TAMANHO:
+                        kb_variavel = FATOR_TAMANHO[kb_radio.value][units.unidade_comprimento]
+                        marin_kb = 1.0
                     else:
                         marin_kb = float(str(kb.value))
                 except:
@@ -789,164 +1466,407 @@ def main(page: Page):
                     marin_kc = 1.0
                     marin_kd = 1.0
                     marin_ke = 1.0
+                    kb_variavel = None
 
-                Se = (
-                    marin_ka
-                    * marin_kb
-                    * marin_kc
-                    * marin_kd
-                    * marin_ke
-                    * float(str(limite_fadiga_linha.value))
-                ) * units.fator_cs
+                Se_linha = float(str(limite_fadiga_linha.value)) * units.fator_cs
+                Se = marin_ka * marin_kb * marin_kc * marin_kd * marin_ke * Se_linha
+                marin = {"ka": marin_ka, "kb": marin_kb, "kc": marin_kc, "kd": marin_kd, "ke": marin_ke}
 
             else:
                 try:
                     Se = float(str(limite_fadiga.value)) * units.fator_cs
                 except:
                     Se = 1
+                Se_linha = Se
+                marin = {}
 
 
 
-            if escolha_d_.value == False:
-                diam = float(str(diametro.value))
-
-                sigma_fm = 32 * Mm / (PI * diam**3)
-                sigma_fa = 32 * Ma / (PI * diam**3)
-                tau_m = 16 * Tm / (PI * diam**3)
-                tau_a = 16 * Ta / (PI * diam**3)
-                sigma_m_linha = np.sqrt((Kff * sigma_fm) ** 2 + 3 * (Kfs * tau_m) ** 2)
-                sigma_a_linha = np.sqrt((Kff * sigma_fa) ** 2 + 3 * (Kfs * tau_a) ** 2)
-                
-
-                if criterio.value == "Goodman":
-                    try:
-                        CS = (Se * tensao_ruptura / (sigma_a_linha * tensao_ruptura + Se * sigma_m_linha))
-                        texto_fadiga.value = f"CS por GOODMAN: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Gerber":
-                    try:
-                        CS = (PI * Se * diam**3 / (8 * A * (1 + (1 + (2 * B * Se / (A * tensao_ruptura)) ** 2) ** 0.5)))
-                        texto_fadiga.value = f"CS por GERBER: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "ASME Elíptico":
-                    try:
-                        CS = (PI * diam**3 / (16 * ( 4 * (Kff * Ma / Se) ** 2 + 
-                                3 * (Kfs * Ta / Se) ** 2 + 4 * (Kff * Mm / tensao_escoamento) ** 2 + 3 * (Kfs * Tm / tensao_escoamento) ** 2)** 0.5))
-                        texto_fadiga.value = f"CS por ASME ELÍPTICO: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Soderberg":
-                    try:
-                        CS = (PI* diam**3 / (16 * (((4 * (Kff * Ma) ** 2 + 3 * (Kfs * Ta) ** 2) ** 0.5) / Se
-                                    + ((4 * (Kff * Mm) ** 2 + 3 * (Kfs * Tm) ** 2)** 0.5) / tensao_escoamento)))
-                        texto_fadiga.value = f"CS por SODERBERG: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Langer (Estático)":
-                    try:
-                        tensao_max = np.sqrt(
-                            (32 * Kff * Mmax / (PI * diam**3)) ** 2
-                            + 3 * (16 * Kfs * Tmax / (PI * diam**3)) ** 2)
-                        CS = tensao_escoamento / tensao_max
-                        texto_fadiga.value = f"CS por Langer: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "von Mises (Estático)":
-                    try:
-                        sigma_max = 32*Kff*(Ma + Mm)/ (PI * diam**3)
-                        tau_max = 16*Kfs*(Ta + Tm) / (PI * diam**3)
-                        sigma_linha = (sigma_max**2 + 3*tau_max**2) ** (1/2)
-                        CS = tensao_escoamento / sigma_linha
-                        texto_fadiga.value = f"CS por von Mises: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-                
-                elif criterio.value == "Tresca (Estático)":
-                    try:
-                        tau_max = ((16*Kff*(Ma+Mm)/(PI * diam**3))**2 + (16*Kfs*(Ta + Tm) / (PI * diam**3))**2) ** 0.5
-                        CS = tensao_escoamento / (2*tau_max)
-                        texto_fadiga.value = f"CS por Tresca: {CS:.3f}"
-                    except:
-                        texto_fadiga.value = "ERRO!"
-                
-                else:
-                    texto_fadiga.value = "ERRO!"
-            
+            modelo = FatigueModel(
+                Kff, Kfs, Ma, Mm, Ta, Tm, Mmax, Tmax,
+                Se=Se, Sut=tensao_ruptura, Sy=tensao_escoamento, kb=kb_variavel,
+            )
+
+            entradas = FatigueInputs(
+                criterio=criterio.value,
+                encontrar_d=escolha_d_.value == True,
+                diametro=str(diametro.value),
+                cs=str(cs.value),
+                cv_resistencia=str(cv_resistencia.value),
+                cv_fatores=str(cv_fatores.value),
+                cv_cargas=str(cv_cargas.value),
+                n_amostras=str(n_amostras.value),
+                ressaltos=str(ressaltos.value),
+                diametros_trechos=str(diametros_trechos.value),
+                max_trechos=str(max_trechos.value),
+                espectro=estado.espectro,
+                resultado_estatico=estado.resultado_estatico,
+                unidade_comprimento=units.unidade_comprimento,
+                unidade_tensao=units.unidade_tensao,
+                fator_cs=units.fator_cs,
+            )
+
+            # O cálculo roda fora do evento; só o último pedido da sessão é aplicado
+            card_grafico_cs.visible = perfil_switch.value == True
+            if perfil_switch.value == True:
+                pedidos.executar("fadiga", perfil_eixo, modelo, entradas, falha=falha_fadiga)
+            elif confiabilidade_switch.value == True and escolha_d_.value == False:
+                medias = {
+                    "Kff": Kff, "Kfs": Kfs, "Ma": Ma, "Mm": Mm, "Ta": Ta, "Tm": Tm, "Mmax": Mmax, "Tmax": Tmax,
+                    "Sut": tensao_ruptura, "Sy": tensao_escoamento, "Se_linha": Se_linha, **marin,
+                }
+                pedidos.executar("fadiga", analise_confiabilidade, medias, entradas, falha=falha_fadiga)
+            elif espectro_switch.value == True and escolha_d_.value == False:
+                pedidos.executar("fadiga", analise_espectro, modelo, entradas, falha=falha_fadiga)
             else:
-                CS = float(str(cs.value))
-                if criterio.value == "Goodman":
-                    try:
-                        expression = (
-                            16 * CS * (
-                                ((4 * (Kff * Ma) ** 2 + 3 * (Kfs * Ta) ** 2) ** 0.5) / Se
-                                + ((4 * (Kff * Mm) ** 2 + 3 * (Kfs * Tm) ** 2) ** 0.5 / tensao_ruptura)) / PI) ** (1.0 / 3)
-                        texto_fadiga.value = f"Diâmetro por GOODMAN: {nsolve(x - expression, 0.5 ):.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Gerber":
-                    try:
-                        expression = (8 * CS * A * (1 + (1 + (2 * B * Se / (A * tensao_ruptura)) ** 2) ** 0.5) / (PI * Se)) ** (1.0 / 3)
-                        texto_fadiga.value = f"Diâmetro por GERBER: {nsolve(x - expression, 0.5):.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "ASME Elíptico":
-                    try:
-                        expression = ((16*CS/PI) * ((4*(Kff*Ma/Se)**2 + 4*(Kff*Mm/tensao_escoamento)**2 + 3*(Kfs*Ta/Se)**2 + 3*(Kfs*Tm/tensao_escoamento)**2 ) ** 0.5))**(1./3)
-                        texto_fadiga.value = f"Diâmetro por ASME ELÍPTICO: {nsolve(x - expression, 0.5 ):.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Soderberg":
-                    try:
-                        expression = x - (16* CS * ((4 * (Kff * Ma) ** 2 + 3 * (Kfs * Ta) ** 2) ** 0.5 / Se
-                                + (4 * (Kff * Mm) ** 2 + 3 * (Kfs * Tm) ** 2) ** 0.5 / tensao_escoamento) / PI) ** (1.0 / 3)
-                        texto_fadiga.value = f"Diâmetro por SODERBERG: {nsolve(expression, 0.5):.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Langer (Estático)":
-                    try:
-                        tensao_max = sqrt((32 * Kff * Mmax / (PI * x**3)) ** 2 + 3 * (16 * Kfs * Tmax / (PI * x**3)) ** 2)  # type: ignore
-                        expression = tensao_max - tensao_escoamento / (CS * units.fator_cs)  # type: ignore
-                        dLanger = nsolve(expression, 0.5)
-                        texto_fadiga.value = f"Diâmetro por Langer: {units.fator*dLanger:.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-                
-                elif criterio.value == "von Mises (Estático)":
-                    try:
-                        sigma_max = 32*Kff*(Ma + Mm)/ (PI * x**3) #type: ignore
-                        tau_max = 16*Kfs*(Ta + Tm) / (PI * x**3) #type: ignore
-                        sigma_linha = (sigma_max**2 + 3*tau_max**2) ** (1/2)
-                        expression = -sigma_linha * (CS * units.fator_cs) + tensao_escoamento
-                        dMises = nsolve(expression, 0.5)
-                        texto_fadiga.value = f"Diâmetro por von Mises: {units.fator*dMises:.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
-
-                elif criterio.value == "Tresca (Estático)":
-                    try:
-                        tau_max = ((16*Kff*(Ma+Mm)/(PI * x**3))**2 + (16*Kfs*(Ta + Tm) / (PI * x**3))**2) ** 0.5 # type: ignore
-                        expression = (2*tau_max) * (CS * units.fator_cs) - tensao_escoamento 
-                        dTresca = nsolve(expression, 0.5)
-                        texto_fadiga.value = f"Diâmetro por Tresca: {units.fator*dTresca:.3E} {units.unidade_comprimento}" # type: ignore
-                    except:
-                        texto_fadiga.value = "ERRO!"
+                pedidos.executar("fadiga", comparacao_criterios, modelo, entradas, falha=falha_fadiga)
+
+        page.update()
+
+    def falha_fadiga(mensagem="ERRO!"):
+        def aplicar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = []
+            card_grafico_cs.visible = False
+        return aplicar
+
+    def comparacao_criterios(modelo, entradas, cancelar):
+        # Todos os critérios são avaliados de uma vez para a tabela de comparação
+        if entradas.encontrar_d == False:
+            diam = float(entradas.diametro)
+            resultados = CACHE_RESULTADOS(coeficientes_seguranca, diam, modelo, unidades=entradas.unidade_comprimento)
+            rotulo, formato, sufixo = "CS", ".3f", ""
+        else:
+            CS = float(entradas.cs)
+            resultados = CACHE_RESULTADOS(diametros, CS, modelo, unidades=entradas.unidade_comprimento)
+            rotulo, formato, sufixo = "Diâmetro", ".3E", f" {entradas.unidade_comprimento}"
 
+        def valido(valor):
+            return np.isfinite(valor) and valor > 0.0
+
+        valor = float(resultados[entradas.criterio])
+        if valido(valor):
+            mensagem = f"{rotulo} por {CRITERIOS[entradas.criterio]}: {valor:{formato}}{sufixo}"
+        else:
+            mensagem = "ERRO!"
+
+        linhas = [
+            Row(
+                [
+                    TextBold(CRITERIOS[nome], 16) if nome == entradas.criterio else TextNormal(CRITERIOS[nome]),
+                    TextBold(f"{float(v):{formato}}{sufixo}" if valido(v) else "-", 16),
+                ],
+                alignment=MainAxisAlignment.SPACE_BETWEEN,
+            )
+            for nome, v in resultados.items()
+        ]
+
+        def mostrar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = linhas
+        yield mostrar
+
+    def analise_confiabilidade(medias, entradas, cancelar):
+        # Valores digitados são as médias; resistências e fatores lognormais, cargas normais
+        try:
+            diam = float(entradas.diametro)
+            cv = {
+                "resistencia": float(entradas.cv_resistencia) / 100,
+                "fator": float(entradas.cv_fatores) / 100,
+                "carga": float(entradas.cv_cargas) / 100,
+            }
+            parametros = {}
+            for nome, media in medias.items():
+                if nome in ("Sut", "Sy", "Se_linha"):
+                    tipo = "resistencia"
+                elif nome in ("Ma", "Mm", "Ta", "Tm", "Mmax", "Tmax"):
+                    tipo = "carga"
                 else:
-                    texto_fadiga.value = "ERRO!"
+                    tipo = "fator"
+
+                if cv[tipo] == 0.0 or media == 0.0:
+                    parametros[nome] = media
+                elif tipo == "carga":
+                    parametros[nome] = Normal(media, cv[tipo] * abs(media))
+                else:
+                    parametros[nome] = LogNormal(media, cv[tipo] * media)
+
+            resultado = CACHE_RESULTADOS(
+                monte_carlo, entradas.criterio, diam, parametros, int(entradas.n_amostras),
+                unidades=entradas.unidade_comprimento, extras={"cancelar": cancelar},
+            )
+        except:
+            yield falha_fadiga()
+            return
+        if resultado is None:
+            return
+
+        mensagem = (
+            f"Probabilidade de falha por {CRITERIOS[entradas.criterio]}: {resultado.pf:.3E} "
+            f"(confiabilidade {100 * resultado.confiabilidade:.4f} %)"
+        )
+        linhas = [("CS médio", resultado.media), ("Desvio padrão do CS", resultado.desvio)]
+        linhas += [(f"CS - percentil {p:g} %", v) for p, v in resultado.percentis.items()]
+
+        def mostrar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = [
+                Row(
+                    [TextNormal(nome), TextBold(f"{v:.3f}", 16)],
+                    alignment=MainAxisAlignment.SPACE_BETWEEN,
+                )
+                for nome, v in linhas
+            ]
+        yield mostrar
+
+    def analise_espectro(modelo, entradas, cancelar):
+        # Dano acumulado (Palmgren-Miner) do espectro de cargas lido do arquivo CSV
+        if entradas.criterio not in CORRECAO_MEDIA:
+            yield falha_fadiga("Escolha um critério de fadiga!")
+            return
+        if entradas.espectro is None:
+            yield falha_fadiga("Escolha o arquivo do espectro!")
+            return
+        try:
+            diam = float(entradas.diametro)
+            espectro = ler_espectro(io.StringIO(entradas.espectro))
+            resultado = CACHE_RESULTADOS(
+                dano_miner, diam, modelo, espectro, entradas.criterio,
+                ksi=KSI[entradas.unidade_comprimento], unidades=entradas.unidade_comprimento,
+            )
+        except:
+            yield falha_fadiga()
+            return
+
+        curva = resultado.curva
+        mensagem = (
+            f"Dano acumulado por {CRITERIOS[entradas.criterio]}: D = {resultado.D:.3E} "
+            f"(vida: {resultado.vida:.3E} repetições do ciclo)"
+        )
+        linhas = [
+            ("Níveis de carga", f"{espectro.ciclos.size}"),
+            ("Ciclos por repetição", f"{np.sum(espectro.ciclos):.3E}"),
+            ("Nível com maior dano", f"{resultado.critico + 1} (D = {resultado.dano[resultado.critico]:.3E})"),
+            ("Fração f de Sut", f"{float(curva.f):.3f}"),
+            ("Curva S-N: a", f"{float(curva.a) / entradas.fator_cs:.1f} {entradas.unidade_tensao}"),
+            ("Curva S-N: b", f"{float(curva.b):.4f}"),
+            ("Limite de fadiga Se", f"{float(curva.Se) / entradas.fator_cs:.1f} {entradas.unidade_tensao}"),
+        ]
 
+        def mostrar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = [
+                Row(
+                    [TextNormal(nome), TextBold(valor, 16)],
+                    alignment=MainAxisAlignment.SPACE_BETWEEN,
+                )
+                for nome, valor in linhas
+            ]
+        yield mostrar
+
+    def perfil_eixo(modelo, entradas, cancelar):
+        # CS ou diâmetro ao longo do eixo a partir dos diagramas da análise estática
+        resultado = entradas.resultado_estatico
+        if resultado is None:
+            yield falha_fadiga("Faça a análise estática primeiro!")
+            return
+
+        if entradas.encontrar_d == True:
+            yield from perfil_eixo_diametro(modelo, resultado, entradas, cancelar)
+            return
+
+        try:
+            trechos = DiameterProfile(
+                [float(v) for v in entradas.diametros_trechos.split(";")],
+                [float(v) for v in entradas.ressaltos.split(";") if v.strip() != ""],
+            )
+            perfis = CACHE_RESULTADOS(perfil_cs, resultado, trechos, modelo, unidades=entradas.unidade_comprimento)
+        except:
+            yield falha_fadiga()
+            return
+
+        escolhido = perfis[entradas.criterio]
+        mensagem = (
+            f"CS mínimo por {CRITERIOS[entradas.criterio]}: {escolhido.cs_min:.3f} "
+            f"(x = {escolhido.x_critico:.3f} {entradas.unidade_comprimento})"
+        )
+        linhas = [
+            Row(
+                [
+                    TextBold(CRITERIOS[nome], 16) if nome == entradas.criterio else TextNormal(CRITERIOS[nome]),
+                    TextBold(f"{p.cs_min:.3f} (x = {p.x_critico:.3f} {entradas.unidade_comprimento})", 16),
+                ],
+                alignment=MainAxisAlignment.SPACE_BETWEEN,
+            )
+            for nome, p in perfis.items()
+        ]
+
+        def mostrar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = linhas
+        yield mostrar
+
+        if cancelar.is_set():
+            return
+        grafico = Grafico(
+            PlotCS, escolhido.x, escolhido.cs, escolhido.x_critico, escolhido.cs_min,
+            entradas.unidade_comprimento, f"CS ao longo do eixo - {CRITERIOS[entradas.criterio]}",
+        )
+
+        def mostrar_grafico():
+            grafico_cs.content = grafico
+        yield mostrar_grafico
+
+    def perfil_eixo_diametro(modelo, resultado, entradas, cancelar):
+        # Diâmetro mínimo d(x) para o CS desejado e proposta de eixo escalonado
+        try:
+            CS = float(entradas.cs)
+            x, requeridos = CACHE_RESULTADOS(perfil_diametro, resultado, CS, modelo, unidades=entradas.unidade_comprimento)
+            d_req = requeridos[entradas.criterio]
+            escalonado, volume = escalonar(
+                x,
+                d_req,
+                int(entradas.max_trechos),
+                DIAMETROS_PADRAO[entradas.unidade_comprimento],
+                candidatos=np.concatenate((resultado.Mh.xk, resultado.Mt.xk)),
+            )
+            if not np.isfinite(volume):
+                raise ValueError
+        except:
+            yield falha_fadiga()
+            return
+
+        i = int(np.argmax(d_req))
+        mensagem = (
+            f"Diâmetro mínimo por {CRITERIOS[entradas.criterio]}: {d_req[i]:.3E} {entradas.unidade_comprimento} "
+            f"(x = {x[i]:.3f} {entradas.unidade_comprimento})"
+        )
+
+        linhas = [
+            Row(
+                [
+                    TextBold(CRITERIOS[nome], 16) if nome == entradas.criterio else TextNormal(CRITERIOS[nome]),
+                    TextBold(f"{np.max(d):.3E} {entradas.unidade_comprimento}", 16),
+                ],
+                alignment=MainAxisAlignment.SPACE_BETWEEN,
+            )
+            for nome, d in requeridos.items()
+        ]
+
+        limites = np.concatenate(([0.0], escalonado.ressaltos, [x[-1]]))
+        linhas.append(CardTitle("Eixo Escalonado"))
+        for k, d in enumerate(escalonado.diametros):
+            linhas.append(
+                Row(
+                    [
+                        TextNormal(f"{limites[k]:.3f} - {limites[k + 1]:.3f} {entradas.unidade_comprimento}"),
+                        TextBold(f"{d:.3E} {entradas.unidade_comprimento}", 16),
+                    ],
+                    alignment=MainAxisAlignment.SPACE_BETWEEN,
+                )
+            )
+
+        def mostrar():
+            texto_fadiga.value = mensagem
+            tabela_criterios.controls = linhas
+        yield mostrar
+
+        if cancelar.is_set():
+            return
+        grafico = Grafico(
+            PlotDiametro, x, d_req, escalonado(x), entradas.unidade_comprimento,
+            f"Diâmetro ao longo do eixo - {CRITERIOS[entradas.criterio]}",
+        )
+
+        def mostrar_grafico():
+            grafico_cs.content = grafico
+        yield mostrar_grafico
+
+    def ajustar_perfil():
+        # No modo perfil os esforços vêm dos diagramas da análise estática
+        perfil = perfil_switch.value == True
+        diametro.visible = escolha_d_.value == False and not perfil
+        ressaltos.visible = perfil and escolha_d_.value == False
+        diametros_trechos.visible = perfil and escolha_d_.value == False
+        max_trechos.visible = perfil and escolha_d_.value == True
+        confiabilidade_switch.visible = not perfil and escolha_d_.value == False
+        confiavel = confiabilidade_switch.visible and confiabilidade_switch.value == True
+        cv_resistencia.visible = confiavel
+        cv_fatores.visible = confiavel
+        cv_cargas.visible = confiavel
+        n_amostras.visible = confiavel
+        espectro_switch.visible = not perfil and escolha_d_.value == False and not confiavel
+        espectro_arquivo.visible = espectro_switch.visible and espectro_switch.value == True
+        if perfil:
+            ma.visible = False
+            mm.visible = False
+            ta.visible = False
+            tm.visible = False
+            m_max.visible = False
+            t_max.visible = False
+
+    def escolher_espectro(e):
+        # O seletor só entra na página quando é usado pela primeira vez
+        if seletor_espectro not in page.overlay:
+            page.overlay.append(seletor_espectro)
+            page.update()
+        seletor_espectro.pick_files(dialog_title="Espectro de carga", allowed_extensions=["csv"])
+
+    def mostrar_espectro(texto, nome):
+        estado.espectro = texto
+        nome_espectro.value = nome
+        nome_espectro.color = None if texto is not None else colors.RED
         page.update()
 
+    def carregar_espectro(caminho, nome):
+        # Lê no máximo TAMANHO_MAX_ESPECTRO + 1 bytes, seja qual for o arquivo
+        try:
+            with open(caminho, "rb") as arquivo:
+                dados = arquivo.read(TAMANHO_MAX_ESPECTRO + 1)
+            if len(dados) > TAMANHO_MAX_ESPECTRO:
+                mostrar_espectro(None, f"{nome}: maior que {TAMANHO_MAX_ESPECTRO // 1024} kB")
+                return
+            mostrar_espectro(dados.decode("utf-8-sig"), nome)
+        except:
+            mostrar_espectro(None, f"{nome}: não foi possível ler o arquivo")
+
+    def espectro_escolhido(e):
+        # No desktop o arquivo é lido do caminho escolhido; no modo web ele é enviado
+        # para PASTA_UPLOADS com um nome único e lido quando o envio termina
+        if not e.files:
+            return
+        arquivo = e.files[0]
+        if arquivo.size > TAMANHO_MAX_ESPECTRO:
+            mostrar_espectro(None, f"{arquivo.name}: maior que {TAMANHO_MAX_ESPECTRO // 1024} kB")
+            return
+        if not page.web:
+            carregar_espectro(arquivo.path, arquivo.name)
+            return
+        destino = f"{uuid.uuid4().hex}.csv"
+        estado.envio_espectro = destino
+        nome_espectro.value = f"Enviando {arquivo.name}..."
+        page.update()
+        seletor_espectro.upload([FilePickerUploadFile(arquivo.name, upload_url=page.get_upload_url(destino, 60))])
+
+    def espectro_enviado(e):
+        destino = estado.envio_espectro
+        if destino is None or (e.error is None and e.progress != 1.0):
+            return
+        estado.envio_espectro = None
+        caminho = os.path.join(PASTA_UPLOADS, destino)
+        if e.error is not None:
+            mostrar_espectro(None, f"{e.file_name}: {e.error}")
+        else:
+            carregar_espectro(caminho, e.file_name)
+        try:
+            os.remove(caminho)
+        except:
+            pass
+
+    def escolha_perfil(e):
+        clean_error_text.limpar(ressaltos, diametros_trechos, max_trechos)
+        escolha_criterio(e)
+
     def escolha_d(e):
         card_fadiga.visible = False
         escolha_cs_.value = not escolha_cs_.value
@@ -966,6 +1886,7 @@ def main(page: Page):
             op1.disabled = False
             op2.disabled = False
 
+        ajustar_perfil()
         page.update()
 
     def escolha_cs(e):
@@ -987,6 +1908,7 @@ def main(page: Page):
             op1.disabled = False
             op2.disabled = False
 
+        ajustar_perfil()
         page.update()
 
     def escolha_se(e):
@@ -1053,6 +1975,7 @@ def main(page: Page):
             t_max.visible = True
             container_limite_fadiga.visible = False
 
+        ajustar_perfil()
         page.update()
 
 
@@ -1064,7 +1987,7 @@ def main(page: Page):
         except:
             e.control.error_text = "Valor digitado inválido! Tente novamente."
         
-        page.update()
+        atualizacoes.marcar(e.control)
             
 
     def verifica_unidade(e):
@@ -1080,7 +2003,7 @@ def main(page: Page):
             except:
                 e.control.error_text = "Valor digitado inválido! Tente novamente."
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_numero(e):
         string = e.control.value
@@ -1092,7 +2015,7 @@ def main(page: Page):
             except:
                 e.control.error_text = "Valor digitado inválido! Tente novamente."
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_comprimento_eixo(e):
         string = e.control.value
@@ -1108,7 +2031,7 @@ def main(page: Page):
             except:
                 e.control.error_text = "Valor digitado inválido! Tente novamente."
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_posicao_apoio_1(e):
         string = e.control.value
@@ -1136,7 +2059,7 @@ def main(page: Page):
         except:
             e.control.error_text = "Precisa adicionar o comprimento do eixo!"
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_posicao_apoio_2(e):
         string = e.control.value
@@ -1167,7 +2090,7 @@ def main(page: Page):
                 "Precisa adicionar o comprimento \ndo eixo e/ou o valor da posição 1!"
             )
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_numero_inteiro(e):
         string = e.control.value
@@ -1179,7 +2102,7 @@ def main(page: Page):
         except:
             e.control.error_text = "Valor digitado inválido! Tente novamente."
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def verifica_numero_rx(e):
         string = e.control.value
@@ -1190,14 +2113,14 @@ def main(page: Page):
                 rx = float(string)
                 if rx < 0.0:
                     e.control.error_text = "Valor precisa ser maior ou igual a zero!"
-                elif rx > comp_eixo:
+                elif rx > estado.comp_eixo:
                     e.control.error_text = (
-                        f"Valor deve estar entre 0 e {comp_eixo:.2f} {units.unidade_comprimento}."
+                        f"Valor deve estar entre 0 e {estado.comp_eixo:.2f} {units.unidade_comprimento}."
                     )
             except:
                 e.control.error_text = "Valor digitado inválido!"
 
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def escolha_material(e):
         if material_switch.value == True:
@@ -1211,7 +2134,7 @@ def main(page: Page):
 
             
         sigma_e.error_text = ""
-        page.update()
+        atualizacoes.marcar(sigma_e, sigma_u, material)
 
     def mudar_material(e):
         if unidades_radio.value == "SI":
@@ -1220,11 +2143,11 @@ def main(page: Page):
         else:
             sigma_u.value = str(LISTA_MATERIAIS.get(e.control.value)[1]) # type: ignore
             sigma_e.value = str(LISTA_MATERIAIS.get(e.control.value)[3]) # type: ignore
-        page.update()
+        atualizacoes.marcar(sigma_u, sigma_e)
 
     def on_focus(e):
         e.control.error_text = ""
-        page.update()
+        atualizacoes.marcar(e.control)
 
     def estatico_torcao(e):
         if kts_switch.value == True:
@@ -1238,7 +2161,7 @@ def main(page: Page):
             kfs.disabled = False
             kfs.value = ""
 
-        page.update()
+        atualizacoes.marcar(kts, qs, kfs)
 
     def kfs_value(e):
         verifica_numero(e)
@@ -1247,7 +2170,7 @@ def main(page: Page):
         except:
             kfs.value = ""
 
-        page.update()
+        atualizacoes.marcar(kfs)
 
     def estatico_flexao(e):
         if ktf_switch.value == True:
@@ -1261,7 +2184,7 @@ def main(page: Page):
             kff.disabled = False
             kff.value = ""
 
-        page.update()
+        atualizacoes.marcar(ktf, qf, kff)
 
     def kff_value(e):
         verifica_numero(e)
@@ -1270,7 +2193,7 @@ def main(page: Page):
         except:
             kff.value = ""
 
-        page.update()
+        atualizacoes.marcar(kff)
 
     def unidade(e):
         if e.control.value != "SI":
@@ -1487,6 +2410,127 @@ def main(page: Page):
         dense=True,
     )
 
+    perfil_switch = Switch(
+        col={"sm": 6},
+        label="Perfil ao longo do eixo",
+        value=False,
+        on_change=escolha_perfil,
+    )
+    ressaltos = TextField(
+        col={"sm": 6},
+        label="Posição dos ressaltos",
+        hint_text="Separadas por ; (ex.: 0.2; 0.5)",
+        suffix_text=units.unidade_comprimento,
+        visible=False,
+        on_focus=on_focus,
+        error_text="",
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+    diametros_trechos = TextField(
+        col={"sm": 6},
+        label="Diâmetro dos trechos",
+        hint_text="Um a mais que os ressaltos, separados por ;",
+        suffix_text=units.unidade_comprimento,
+        visible=False,
+        on_focus=on_focus,
+        error_text="",
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+
+    max_trechos = TextField(
+        col={"sm": 6},
+        label="Máximo de trechos",
+        hint_text="Trechos do eixo escalonado",
+        value="3",
+        visible=False,
+        max_length=2,
+        on_blur=verifica_numero_inteiro,
+        on_focus=on_focus,
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+
+    confiabilidade_switch = Switch(
+        col={"sm": 6},
+        label="Confiabilidade (Monte Carlo)",
+        value=False,
+        on_change=escolha_perfil,
+    )
+    cv_resistencia = TextField(
+        col={"sm": 6},
+        label="Coef. de variação das resistências",
+        hint_text="Sut, Sy e Se'",
+        suffix_text="%",
+        value="5",
+        visible=False,
+        max_length=5,
+        on_blur=verifica_numero,
+        on_focus=on_focus,
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+    cv_fatores = TextField(
+        col={"sm": 6},
+        label="Coef. de variação dos fatores",
+        hint_text="Kff, Kfs e fatores de Marin",
+        suffix_text="%",
+        value="5",
+        visible=False,
+        max_length=5,
+        on_blur=verifica_numero,
+        on_focus=on_focus,
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+    cv_cargas = TextField(
+        col={"sm": 6},
+        label="Coef. de variação das cargas",
+        hint_text="Momentos e torques",
+        suffix_text="%",
+        value="10",
+        visible=False,
+        max_length=5,
+        on_blur=verifica_numero,
+        on_focus=on_focus,
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+    n_amostras = TextField(
+        col={"sm": 6},
+        label="Número de amostras",
+        value="1000000",
+        visible=False,
+        max_length=9,
+        on_blur=verifica_numero_inteiro,
+        on_focus=on_focus,
+        height=TEXTFIELD_HEIGHT,
+        dense=True,
+    )
+
+    espectro_switch = Switch(
+        col={"sm": 6},
+        label="Espectro de carga (Miner)",
+        value=False,
+        on_change=escolha_perfil,
+    )
+    nome_espectro = TextNormal("Nenhum arquivo escolhido")
+    espectro_arquivo = Row(
+        [
+            FilledButton(
+                text="Arquivo CSV",
+                icon=icons.UPLOAD_FILE,
+                tooltip="Colunas Ma, Mm, Ta, Tm e ciclos (ou rpm e horas)",
+                on_click=escolher_espectro,
+            ),
+            nome_espectro,
+        ],
+        col={"sm": 6},
+        visible=False,
+    )
+    seletor_espectro = FilePicker(on_result=espectro_escolhido, on_upload=espectro_enviado)
+
     material_switch = Switch(
         label="Usar material personalizado", value=False, on_change=escolha_material,
         
@@ -1801,6 +2845,9 @@ def main(page: Page):
     )
 
     texto_fadiga = Text(size=20, weight=FontWeight.BOLD)
+    tabela_criterios = Column(spacing=10)
+    grafico_cs = Container()
+    card_grafico_cs = Card(content=grafico_cs, elevation=3, margin=5, visible=False)
 
     btn_verificar = FilledButton(text="Verificar", on_click=dinamica)
 
@@ -1817,13 +2864,25 @@ def main(page: Page):
                 ),
                 elevation=3,
                 margin=5,
-            )
+            ),
+            Card(
+                content=Container(
+                    content=Column(
+                        [CardTitle("Comparação de Critérios"), tabela_criterios],
+                        spacing=10,
+                    ),
+                    padding=20,
+                ),
+                elevation=3,
+                margin=5,
+            ),
+            card_grafico_cs,
         ],
         alignment=MainAxisAlignment.CENTER,
         visible=False,
     )
 
-    unidade_medida = [comprimento_eixo, apoio_1, apoio_2, rx, ry, rz, diametro]
+    unidade_medida = [comprimento_eixo, apoio_1, apoio_2, rx, ry, rz, diametro, ressaltos, diametros_trechos]
     unidade_momento = [ma, mm, m_max, ta, tm, t_max]
     unidade_limite = [sigma_e, sigma_u, limite_fadiga, limite_fadiga_linha]
 
@@ -1896,45 +2955,68 @@ def main(page: Page):
         ),
     )
 
-    menus = Tabs(
-        tabs=[
-            Tab(
-                text="Análise de Fadiga",
-                # icon=icons.SETTINGS,
-                content=Container(
-                    margin=5,
-                    alignment=alignment.center,
-                    padding=5,
-                    content=Column(
-                        [
-                            ResponsiveRow([Column([escolha_d_, escolha_cs_,], col={"sm": 6})],),
-                            Row(),
-                            ResponsiveRow(
-                                [diametro, cs, criterio, ma, mm, ta, tm, m_max, t_max],
-                                spacing=30,
-                            ),
-                            container_material,
-                            ResponsiveRow([container_ktf, container_kts], spacing=30),
-                            container_limite_fadiga,
-                            card_fadiga,
-                            GRADIENTE,
-                            Row([btn_verificar], alignment=MainAxisAlignment.CENTER),
-                        ],
-                        spacing=20,
-                        expand=3,
-                        scroll=ScrollMode.AUTO,
+    def construir_fadiga():
+        # Os controles já existem, mas o formulário só entra na árvore da página (e só
+        # é enviado ao cliente) quando a aba é aberta pela primeira vez
+        return Container(
+            margin=5,
+            alignment=alignment.center,
+            padding=5,
+            content=Column(
+                [
+                    ResponsiveRow([Column([escolha_d_, escolha_cs_,], col={"sm": 6}), perfil_switch],),
+                    Row(),
+                    ResponsiveRow(
+                        [diametro, cs, criterio, ma, mm, ta, tm, m_max, t_max, ressaltos, diametros_trechos, max_trechos],
+                        spacing=30,
                     ),
-                ),
+                    ResponsiveRow(
+                        [confiabilidade_switch, cv_resistencia, cv_fatores, cv_cargas, n_amostras],
+                        spacing=30,
+                    ),
+                    ResponsiveRow([espectro_switch, espectro_arquivo], spacing=30),
+                    container_material,
+                    ResponsiveRow([container_ktf, container_kts], spacing=30),
+                    container_limite_fadiga,
+                    card_fadiga,
+                    GRADIENTE,
+                    Row([btn_verificar], alignment=MainAxisAlignment.CENTER),
+                ],
+                spacing=20,
+                expand=3,
+                scroll=ScrollMode.AUTO,
             ),
-        ],
+        )
+
+    def abrir_aba(e):
+        if menus.tabs[menus.selected_index] is aba_fadiga and aba_fadiga.content is None:  # type: ignore
+            aba_fadiga.content = construir_fadiga()
+            page.update()
+
+    aba_fadiga = Tab(text="Análise de Fadiga")
+
+    menus = Tabs(
+        tabs=[aba_fadiga],
         expand=1,
+        on_change=abrir_aba,
     )
 
     menus.tabs.insert(0, dados_iniciais)  # type: ignore
     menus.selected_index = 0
 
+    primeiro_quadro = perf_counter()
     page.add(menus)
+    fim = perf_counter()
+
+    # Tempos desta sessão; o das importações é registrado uma vez, ao iniciar o app
+    registro.info(
+        "Sessão: interface %.0f ms, primeiro quadro %.0f ms",
+        1000 * (primeiro_quadro - construcao), 1000 * (fim - primeiro_quadro),
+    )
 
 
 if __name__ == '__main__':
-    app(target=main, assets_dir="assets")
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    registro.info("Inicialização: importações %.0f ms", 1000 * (IMPORTADO - INICIO))
+    os.makedirs(PASTA_UPLOADS, exist_ok=True)
+    app(target=main, assets_dir="assets", upload_dir=PASTA_UPLOADS)
\ No newline at end of file
@@ -0,0 +1,145 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Otimização da posição dos apoios (mancais) do eixo
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+
+from estatica import ShaftModel, diagrama_torque, reacoes_batch, torques
+from fadiga import coeficientes_seguranca_estacoes
+
+
+class BearingOptimum:
+    # valor é o pico do momento resultante (objetivo "momento") ou o CS mínimo ao longo
+    # do eixo (objetivo "cs") com os apoios em a e b
+    def __init__(self, a, b, valor, objetivo, avaliacoes) -> None:
+        self.a = a
+        self.b = b
+        self.valor = valor
+        self.objetivo = objetivo
+        self.avaliacoes = avaliacoes
+
+
+def _viaveis(a, b, comp_eixo, espacamento, proibidas):
+    distancia = b - a
+    ok = (a >= 0.0) & (b <= comp_eixo) & (distancia > 0.0)
+    ok &= (distancia >= espacamento[0]) & (distancia <= espacamento[1])
+    for inicio, fim in proibidas:
+        ok &= ~((a > inicio) & (a < fim)) & ~((b > inicio) & (b < fim))
+    return ok
+
+
+def _vertices(a, b, f, r):
+    # Mh e Mv exatos nos vértices (posições das forças e dos apoios) para cada par (a, b).
+    # Entre vértices os diagramas são lineares, então o máximo de hypot(Mh, Mv) e o CS
+    # mínimo (com diâmetro constante) ficam sempre em um vértice.
+    P, k = a.size, f.shape[0]
+    A, B = reacoes_batch(np.column_stack((a, b)), np.broadcast_to(f, (P, k, 3)), np.broadcast_to(r, (P, k, 3)))
+    pos = np.column_stack((np.broadcast_to(r[:, 0], (P, k)), a, b))
+    Fy = np.column_stack((np.broadcast_to(f[:, 1], (P, k)), A[:, 1], B[:, 1]))
+    Fz = np.column_stack((np.broadcast_to(f[:, 2], (P, k)), A[:, 2], B[:, 2]))
+
+    # s[p, j, i] = <x_j - d_i>; um produto em lote dá os dois planos
+    s = np.maximum(pos[:, :, np.newaxis] - pos[:, np.newaxis, :], 0.0)
+    M = s @ np.stack((Fy, -Fz), axis=-1)
+    return pos, M[..., 1], M[..., 0]
+
+
+def otimizar_apoios(
+    modelo: ShaftModel,
+    espacamento=None,
+    espacamento_min_frac=0.1,
+    proibidas=(),
+    objetivo="momento",
+    d=None,
+    fadiga=None,
+    criterio="Goodman",
+    n=81,
+    inicios=4,
+    tol=1e-6,
+    bloco=4096,
+) -> BearingOptimum:
+    # Procura as posições dos apoios A < B que minimizam o pico do momento resultante
+    # (objetivo "momento") ou maximizam o CS mínimo para o diâmetro d e o FatigueModel
+    # fadiga (objetivo "cs"). Só as forças de modelo são usadas. espacamento é
+    # (mínimo, máximo) para B - A; sem ele o mínimo é espacamento_min_frac do
+    # comprimento (apoios muito próximos "abraçam" uma carga e dão momento quase nulo,
+    # um projeto sem sentido) e o máximo é o comprimento todo. proibidas é uma lista
+    # de intervalos (início, fim) onde nenhum apoio pode ficar. Uma grade n x n grossa
+    # é avaliada de uma vez; os melhores pontos são refinados por grades locais 5 x 5
+    # que encolhem pela metade até o passo ficar menor que tol * comprimento.
+    L = modelo.comp_eixo
+    f, r = modelo.f, modelo.r
+    if espacamento is None:
+        espacamento = (espacamento_min_frac * L, L)
+    if objetivo == "cs":
+        if d is None or fadiga is None:
+            raise ValueError("O objetivo 'cs' precisa do diâmetro e do modelo de fadiga")
+        # O torque não depende dos apoios
+        Mt = diagrama_torque(r[:, 0], torques(r, f), L)
+    elif objetivo != "momento":
+        raise ValueError(f"Objetivo desconhecido: {objetivo}")
+
+    avaliacoes = 0
+
+    def custo(a, b):
+        # Valor a minimizar em cada par; pares inviáveis ficam com +inf
+        nonlocal avaliacoes
+        valor = np.full(a.size, np.inf)
+        ok = np.flatnonzero(_viaveis(a, b, L, espacamento, proibidas))
+        avaliacoes += ok.size
+        for i in range(0, ok.size, bloco):
+            sel = ok[i:i + bloco]
+            pos, Mh, Mv = _vertices(a[sel], b[sel], f, r)
+            if objetivo == "momento":
+                valor[sel] = np.max(np.hypot(Mh, Mv), axis=1)
+            else:
+                cs = np.minimum(
+                    coeficientes_seguranca_estacoes(Mh, Mv, Mt(pos), d, fadiga, (criterio,))[criterio],
+                    coeficientes_seguranca_estacoes(Mh, Mv, Mt(pos, True), d, fadiga, (criterio,))[criterio],
+                )
+                valor[sel] = -np.min(cs, axis=1)
+        return valor
+
+    # Grade grossa sobre todos os pares (a, b)
+    malha = np.linspace(0.0, L, num=n)
+    a, b = (m.ravel() for m in np.meshgrid(malha, malha, indexing="ij"))
+    valor = custo(a, b)
+    if not np.isfinite(valor).any():
+        raise ValueError("Nenhuma posição dos apoios atende às restrições")
+
+    ordem = np.argsort(valor)[:inicios]
+    ordem = ordem[np.isfinite(valor[ordem])]
+    atual = np.column_stack((a[ordem], b[ordem]))
+    melhor = valor[ordem]
+
+    # Refinamento local de todos os pontos iniciais ao mesmo tempo
+    passo = L / (n - 1)
+    deslocamentos = np.array([(i, j) for i in range(-2, 3) for j in range(-2, 3)], dtype=float)
+    while passo > tol * L:
+        candidatos = atual[:, np.newaxis, :] + passo * deslocamentos
+        valores = custo(candidatos[..., 0].ravel(), candidatos[..., 1].ravel()).reshape(candidatos.shape[:2])
+        k = np.argmin(valores, axis=1)
+        novos = valores[np.arange(k.size), k]
+        melhorou = novos < melhor
+        atual[melhorou] = candidatos[np.flatnonzero(melhorou), k[melhorou]]
+        melhor[melhorou] = novos[melhorou]
+        passo /= 2
+
+    i = int(np.argmin(melhor))
+    valor = -melhor[i] if objetivo == "cs" else melhor[i]
+    return BearingOptimum(float(atual[i, 0]), float(atual[i, 1]), float(valor), objetivo, avaliacoes)
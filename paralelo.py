@@ -0,0 +1,166 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Varreduras de projeto em paralelo (casos de carga x diâmetros x materiais x critérios)
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from estatica import solve_statics
+from fadiga import CRITERIOS, FatigueModel, coeficientes_seguranca
+
+
+class SweepSpec:
+    # casos: lista de ShaftModel; materiais: lista de (Sut, Sy, Se) em Pa/psi.
+    # O resultado é o CS mínimo ao longo do eixo (diâmetro constante) para cada
+    # combinação, com forma (casos, diâmetros, materiais, critérios).
+    def __init__(self, casos, diametros, materiais, criterios=tuple(CRITERIOS), Kff=1.0, Kfs=1.0, kb=None, n=200) -> None:
+        self.casos = list(casos)
+        self.diametros = np.atleast_1d(np.asarray(diametros, dtype=float))
+        self.materiais = np.asarray(materiais, dtype=float).reshape(-1, 3)
+        self.criterios = tuple(criterios)
+        self.Kff = Kff
+        self.Kfs = Kfs
+        self.kb = kb
+        self.n = n
+
+    @property
+    def forma(self):
+        return (len(self.casos), self.diametros.size, self.materiais.shape[0], len(self.criterios))
+
+
+class SweepResult:
+    def __init__(self, cs, concluido, cancelado) -> None:
+        self.cs = cs
+        self.concluido = concluido
+        self.cancelado = cancelado
+
+
+def calcular_caso(spec: SweepSpec, caso):
+    # CS mínimo ao longo do eixo para um caso de carga: (diâmetros, materiais, critérios)
+    resultado = solve_statics(caso)
+    x, esquerda = resultado.estacoes(spec.n)
+    Mh, Mv, Mt = resultado.avaliar(x, esquerda)
+    Ma, Tm = np.hypot(Mh, Mv), np.abs(Mt)
+
+    # Eixos de broadcasting: (materiais, diâmetros, estações)
+    Sut, Sy, Se = (spec.materiais[:, k, np.newaxis, np.newaxis] for k in range(3))
+    m = FatigueModel(
+        spec.Kff, spec.Kfs, Ma=Ma, Tm=Tm, Mmax=Ma, Tmax=Tm,
+        Se=Se, Sut=Sut, Sy=Sy, kb=spec.kb,
+    )
+    cs = coeficientes_seguranca(spec.diametros[:, np.newaxis], m, spec.criterios)
+    return np.stack([np.min(cs[criterio], axis=-1).T for criterio in spec.criterios], axis=-1)
+
+
+# Estado de cada processo trabalhador, preenchido uma única vez pelo inicializador
+_TRABALHO = {}
+
+
+def _iniciar(spec, nome, arquivo):
+    # O spec é enviado uma vez por processo; cada tarefa só recebe o intervalo de casos
+    if arquivo is None:
+        memoria = shared_memory.SharedMemory(name=nome)
+        saida = np.ndarray(spec.forma, dtype=float, buffer=memoria.buf)
+    else:
+        memoria = None
+        saida = np.memmap(arquivo, dtype=float, mode="r+", shape=spec.forma)
+    _TRABALHO.update(spec=spec, memoria=memoria, saida=saida)
+
+
+def _executar(inicio, fim):
+    # Os resultados vão direto para a memória compartilhada; só o intervalo volta
+    spec, saida = _TRABALHO["spec"], _TRABALHO["saida"]
+    for i in range(inicio, fim):
+        saida[i] = calcular_caso(spec, spec.casos[i])
+    return inicio, fim
+
+
+def executar_varredura(spec: SweepSpec, processos=None, tamanho_tarefa=None, arquivo=None, progresso=None, cancelar=None) -> SweepResult:
+    # progresso(feitos, total) é chamado a cada tarefa concluída; cancelar é um
+    # objeto com is_set() (ex.: threading.Event). Casos não calculados ficam NaN.
+    # Com arquivo, o resultado é um np.memmap nesse caminho em vez de shared_memory.
+    total = len(spec.casos)
+    processos = processos or os.cpu_count() or 1
+    if tamanho_tarefa is None:
+        # Algumas tarefas por processo para equilibrar a carga sem excesso de mensagens
+        tamanho_tarefa = max(1, -(-total // (4 * processos)))
+
+    concluido = np.zeros(total, dtype=bool)
+    memoria = None
+    if arquivo is not None:
+        cs = np.memmap(arquivo, dtype=float, mode="w+", shape=spec.forma)
+    elif processos > 1:
+        memoria = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(spec.forma)) * 8))
+        cs = np.ndarray(spec.forma, dtype=float, buffer=memoria.buf)
+    else:
+        cs = np.empty(spec.forma)
+    cs[...] = np.nan
+
+    intervalos = [(i, min(i + tamanho_tarefa, total)) for i in range(0, total, tamanho_tarefa)]
+    cancelado = False
+
+    if processos == 1:
+        for inicio, fim in intervalos:
+            if cancelar is not None and cancelar.is_set():
+                cancelado = True
+                break
+            for i in range(inicio, fim):
+                cs[i] = calcular_caso(spec, spec.casos[i])
+            concluido[inicio:fim] = True
+            if progresso is not None:
+                progresso(int(np.count_nonzero(concluido)), total)
+        if arquivo is not None:
+            cs.flush()
+        return SweepResult(cs, concluido, cancelado)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            initializer=_iniciar,
+            initargs=(spec, None if memoria is None else memoria.name, arquivo),
+        ) as executor:
+            pendentes = {executor.submit(_executar, inicio, fim) for inicio, fim in intervalos}
+            while pendentes:
+                # Espera com timeout para perceber o cancelamento mesmo sem tarefas terminando
+                prontas, pendentes = wait(pendentes, timeout=0.1, return_when=FIRST_COMPLETED)
+                for tarefa in prontas:
+                    inicio, fim = tarefa.result()
+                    concluido[inicio:fim] = True
+                if prontas and progresso is not None:
+                    progresso(int(np.count_nonzero(concluido)), total)
+                if cancelar is not None and cancelar.is_set():
+                    cancelado = True
+                    for tarefa in pendentes:
+                        tarefa.cancel()
+                    break
+
+        if memoria is not None:
+            cs = np.array(cs)
+        # Tarefas em andamento no cancelamento terminam, mas não contam como concluídas
+        cs[~concluido] = np.nan
+        if arquivo is not None:
+            cs.flush()
+    finally:
+        if memoria is not None:
+            memoria.close()
+            memoria.unlink()
+
+    return SweepResult(cs, concluido, cancelado)
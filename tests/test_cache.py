@@ -0,0 +1,78 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes do cache de resultados
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from cache import ResultCache, chave
+
+
+class Ponto:
+    def __init__(self, x) -> None:
+        self.x = x
+
+    def dobro(self):
+        return 2 * self.x
+
+
+def soma(a, b):
+    return a + b
+
+
+def test_lambdas_nao_geram_chave():
+    cache = ResultCache()
+    with pytest.raises(TypeError):
+        cache(lambda: 1)
+    with pytest.raises(TypeError):
+        chave(lambda x: x)
+
+
+def test_funcoes_locais_nao_geram_chave():
+    def local():
+        return 1
+
+    with pytest.raises(TypeError):
+        chave(local)
+
+
+def test_metodos_de_objetos_diferentes_nao_colidem():
+    assert chave(Ponto(1).dobro) != chave(Ponto(2).dobro)
+    assert chave(Ponto(1).dobro) == chave(Ponto(1).dobro)
+
+
+def test_objetos_pelo_conteudo():
+    # Objetos distintos com os mesmos dados têm a mesma chave; dados diferentes, não
+    assert chave(Ponto(np.arange(3.0))) == chave(Ponto(np.arange(3.0)))
+    assert chave(Ponto(np.arange(3.0))) != chave(Ponto(np.arange(3.0) + 1))
+
+
+def test_numeros_e_arrays_inteiros_ou_float():
+    assert chave(2) == chave(2.0) == chave(np.float64(2)) == chave(np.array(2))
+    assert chave(np.array([2, 3])) == chave(np.array([2.0, 3.0])) == chave(np.array([2, 3], dtype=np.float32))
+    assert chave(np.array([2, 3])) != chave(np.array([2, 4]))
+    assert chave(np.array([2, 3])) != chave(np.array([[2, 3]]))
+    assert chave(True) != chave(1)
+
+
+def test_cache_devolve_o_resultado_da_funcao_certa():
+    cache = ResultCache()
+    assert cache(soma, 1, 2) == 3
+    assert cache(soma, 1.0, 2.0) == 3
+    assert cache.estatisticas()["acertos"] == 1
+    assert cache(soma, 1, 3) == 4
@@ -0,0 +1,54 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes da análise de confiabilidade
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import threading
+
+import numpy as np
+
+from confiabilidade import LogNormal, Normal, _bloco, monte_carlo
+
+PARAMETROS = {
+    "Sut": LogNormal(690e6, 0.05 * 690e6), "Sy": LogNormal(580e6, 0.05 * 580e6),
+    "Ma": Normal(150.0, 15.0), "Tm": Normal(100.0, 10.0), "Kff": 1.7, "Kfs": 1.5,
+}
+
+
+def test_sementes_por_bloco_iguais_as_de_spawn():
+    # As sementes geradas bloco a bloco são as mesmas de SeedSequence.spawn(n_blocos)
+    resultado = monte_carlo("Goodman", 0.02, PARAMETROS, 25_000, bloco=10_000, semente=7)
+    sementes = np.random.SeedSequence(7).spawn(3)
+    cs = np.concatenate([
+        _bloco("Goodman", 0.02, PARAMETROS, np.random.default_rng(s), n)
+        for s, n in zip(sementes, (10_000, 10_000, 5_000))
+    ])
+    assert resultado.falhas == np.count_nonzero(~(cs >= 1.0))
+    np.testing.assert_allclose(resultado.media, np.mean(cs))
+
+
+def test_mesma_semente_mesmo_resultado():
+    a = monte_carlo("Goodman", 0.02, PARAMETROS, 20_000, bloco=3_000, semente=3)
+    b = monte_carlo("Goodman", 0.02, PARAMETROS, 20_000, bloco=3_000, semente=3)
+    assert a.falhas == b.falhas
+    assert a.percentis == b.percentis
+
+
+def test_cancelado_retorna_none():
+    cancelar = threading.Event()
+    cancelar.set()
+    assert monte_carlo("Goodman", 0.02, PARAMETROS, 20_000, cancelar=cancelar) is None
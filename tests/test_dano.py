@@ -0,0 +1,79 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes do dano acumulado por fadiga
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import io
+
+import numpy as np
+import pytest
+
+from dano import KSI, DutyCycle, SNCurve, dano_miner, ler_espectro
+from fadiga import FatigueModel
+
+
+def test_curva_sn_passa_pelos_pontos_de_ajuste():
+    # f * Sut em 10**3 ciclos e Se em Ne; abaixo de Se a vida é infinita
+    curva = SNCurve(100e3, 40e3, f=0.9, ksi=KSI["in"])
+    np.testing.assert_allclose(curva.ciclos(90e3), 1e3)
+    np.testing.assert_allclose(curva.ciclos(40e3 * (1 + 1e-12)), 1e6, rtol=1e-6)
+    assert curva.ciclos(39e3) == np.inf
+
+
+def test_se_acima_de_f_sut_e_rejeitado():
+    with pytest.raises(ValueError):
+        SNCurve(100e3, 95e3, f=0.9, ksi=KSI["in"])
+    with pytest.raises(ValueError):
+        SNCurve(100e3, 90e3, f=0.9, ksi=KSI["in"])
+
+
+def test_vida_nunca_cresce_com_a_tensao():
+    # Acima de f * Sut a curva segue a reta de baixo ciclo (Sut em 1 ciclo), sem extrapolar
+    curva = SNCurve(100e3, 40e3, f=0.9, ksi=KSI["in"])
+    S = np.linspace(41e3, 120e3, 200)
+    N = curva.ciclos(S)
+    assert np.all(np.diff(N) <= 0)
+    assert np.all(N[S > 90e3] <= 1e3)
+    np.testing.assert_allclose(curva.ciclos(99.999e3), 1.0, rtol=1e-3)
+    assert curva.ciclos(100e3) == 0.0
+    assert curva.ciclos(150e3) == 0.0
+
+
+def test_dano_e_a_soma_de_n_sobre_N():
+    m = FatigueModel(1.0, 1.0, Se=40e3, Sut=100e3, Sy=80e3)
+    d = 1.0
+    # Só flexão alternada: S = 32 * Ma / (pi * d**3)
+    Ma = np.array([60e3, 50e3, 30e3]) * np.pi / 32
+    curva = SNCurve(100e3, 40e3, f=0.9, ksi=KSI["in"])
+    N = curva.ciclos([60e3, 50e3])
+    resultado = dano_miner(d, m, DutyCycle(Ma=Ma, ciclos=[N[0] / 4, N[1] / 2, 1e9]), f=0.9, ksi=KSI["in"])
+    np.testing.assert_allclose(resultado.dano, [0.25, 0.5, 0.0])
+    np.testing.assert_allclose(resultado.vida, 1 / 0.75)
+    assert resultado.critico == 1
+
+
+def test_criterio_estatico_e_rejeitado():
+    m = FatigueModel(1.0, 1.0, Se=40e3, Sut=100e3, Sy=80e3)
+    with pytest.raises(ValueError):
+        dano_miner(1.0, m, DutyCycle(Ma=1.0), criterio="Tresca (Estático)")
+
+
+def test_espectro_com_ponto_e_virgula_e_rpm():
+    ciclo = ler_espectro(io.StringIO("Ma;Tm;rpm;horas\n10,5;2;100;1\n\n20;;50;0,5\n"))
+    np.testing.assert_allclose(ciclo.Ma, [10.5, 20.0])
+    np.testing.assert_allclose(ciclo.Tm, [2.0, 0.0])
+    np.testing.assert_allclose(ciclo.ciclos, [6000.0, 1500.0])
@@ -0,0 +1,53 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes da redução de pontos dos gráficos
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from decimacao import decimar, lttb
+
+
+def test_orcamento_pequeno_nao_devolve_todos_os_pontos():
+    x = np.arange(10.0)
+    assert len(decimar(x, x, 3)) <= 3
+    assert len(decimar(x, x, 4)) <= 4
+
+
+# Extremidades, máximo e mínimo (4 pontos obrigatórios) cabem em todos os orçamentos
+@pytest.mark.parametrize("orcamento", [4, 5, 6, 10, 50, 400])
+def test_orcamento_e_respeitado(orcamento):
+    x = np.linspace(0.0, 1.0, 2000)
+    y = np.sin(20 * x)
+    i = decimar(x, y, orcamento)
+    assert len(i) <= orcamento
+    assert i[0] == 0 and i[-1] == x.size - 1
+    assert np.argmax(y) in i and np.argmin(y) in i
+
+
+def test_degraus_sao_mantidos():
+    x = np.concatenate((np.linspace(0, 1, 500), np.linspace(1, 2, 500)))
+    y = np.where(np.arange(x.size) < 500, 0.0, 1.0)
+    i = decimar(x, y, 20)
+    assert 499 in i and 500 in i
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_lttb_com_menos_de_tres_pontos(n):
+    x = np.arange(10.0)
+    assert len(lttb(x, x, n)) == n
@@ -0,0 +1,46 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes da análise estática incremental
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+
+from estatica import IncrementalStatics, ShaftModel, solve_statics
+
+
+def test_identificador_sobrevive_a_remocao_de_outra_forca():
+    estatica = IncrementalStatics(11.5, (0.75, 10.75))
+    a = estatica.adicionar([0, 450, 0], [3.0, 0, 0])
+    b = estatica.adicionar([0, -885, -2431], [8.5, 1.335, 0])
+    estatica.remover(estatica.indice(a))
+    assert estatica.indice(a) is None
+    assert estatica.indice(b) == 0
+
+
+def test_remover_duas_vezes_pelo_identificador_remove_uma_forca():
+    estatica = IncrementalStatics(11.5, (0.75, 10.75))
+    a = estatica.adicionar([0, 450, 0], [3.0, 0, 0])
+    estatica.adicionar([0, -885, -2431], [8.5, 1.335, 0])
+    for _ in range(2):
+        i = estatica.indice(a)
+        if i is not None:
+            estatica.remover(i)
+
+    esperado = solve_statics(ShaftModel(11.5, (0.75, 10.75), estatica.f, estatica.r))
+    assert len(estatica.f) == 1
+    np.testing.assert_allclose(estatica.A, esperado.A)
+    np.testing.assert_allclose(estatica.B, esperado.B)
@@ -0,0 +1,60 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes do modo em lote
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import io
+import json
+
+from cache import ResultCache
+from lote import ler_jsonl, processar
+
+
+CASO = {
+    "comp_eixo": 11.5, "apoio_1": 0.75, "apoio_2": 10.75,
+    "forcas": [[-197, 540, 2.75, 6, 0], [-885, -2431, 8.5, 1.335, 0]],
+    "Sut": 735, "Sy": 574, "Se": 204.8, "Kff": 1.577, "Kfs": 1.386, "d": 0.028,
+}
+
+
+def linhas_jsonl(*linhas):
+    return list(processar(ler_jsonl(io.StringIO("\n".join(linhas) + "\n")), ResultCache()))
+
+
+def test_json_invalido_vira_linha_de_erro():
+    resultado = linhas_jsonl(json.dumps({"id": "a", **CASO}), "{nao e json", json.dumps({"id": "b", **CASO}))
+    assert [linha["id"] for linha in resultado] == ["a", 1, "b"]
+    assert resultado[1]["erro"].startswith("JSONDecodeError")
+    assert "erro" not in resultado[0] and "erro" not in resultado[2]
+
+
+def test_caso_que_nao_e_objeto_vira_linha_de_erro():
+    resultado = linhas_jsonl("[1, 2]", json.dumps(CASO))
+    assert resultado[0] == {"id": 0, "erro": "ValueError: O caso deve ser um objeto, não list"}
+    assert "CS" in resultado[1]
+
+
+def test_erro_de_calculo_nao_interrompe_o_lote():
+    resultado = list(processar([{"id": 7, "comp_eixo": 1.0}, CASO], ResultCache()))
+    assert resultado[0]["id"] == 7 and "erro" in resultado[0]
+    assert "erro" not in resultado[1]
+
+
+def test_id_zero_ou_vazio_e_mantido():
+    resultado = list(processar([{"id": 0, **CASO}, {"id": "", **CASO}, {"id": 0}], ResultCache()))
+    assert [linha["id"] for linha in resultado] == [0, "", 0]
+    assert "erro" in resultado[2]
@@ -0,0 +1,60 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes da otimização da posição dos apoios
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from estatica import ShaftModel
+from otimizacao import otimizar_apoios
+
+
+def modelo(f, r, comp_eixo=10.0):
+    return ShaftModel(comp_eixo, (0.5, 9.5), np.array(f, dtype=float), np.array(r, dtype=float))
+
+
+def test_uma_carga_nao_junta_os_apoios():
+    otimo = otimizar_apoios(modelo([[0, -1000, 0]], [[5.9, 0, 0]]))
+    assert otimo.b - otimo.a >= 0.1 * 10.0 - 1e-9
+    assert otimo.valor > 0.0
+
+
+def test_espacamento_e_zonas_proibidas_sao_respeitados():
+    rng = np.random.default_rng(1)
+    f = np.column_stack((np.zeros(12), rng.normal(0, 1000, 12), rng.normal(0, 1000, 12)))
+    r = np.column_stack((rng.uniform(0, 10, 12), np.zeros(12), np.zeros(12)))
+    otimo = otimizar_apoios(modelo(f, r), espacamento=(4.0, 7.0), proibidas=((2.0, 3.0), (6.0, 8.0)))
+    assert 4.0 - 1e-9 <= otimo.b - otimo.a <= 7.0 + 1e-9
+    for x in (otimo.a, otimo.b):
+        assert not (2.0 < x < 3.0) and not (6.0 < x < 8.0)
+
+
+def test_fracao_minima_pode_ser_alterada():
+    otimo = otimizar_apoios(modelo([[0, -1000, 0]], [[5.9, 0, 0]]), espacamento_min_frac=0.3)
+    assert otimo.b - otimo.a >= 0.3 * 10.0 - 1e-9
+
+
+def test_espacamento_do_chamador_e_respeitado():
+    # Mancais próximos em um eixo longo: o mínimo informado vale mesmo abaixo de 10%
+    otimo = otimizar_apoios(modelo([[0, -1000, 0]], [[5.0, 0, 0]], comp_eixo=100.0), espacamento=(2.0, 3.0))
+    assert 2.0 - 1e-9 <= otimo.b - otimo.a <= 3.0 + 1e-9
+
+
+def test_restricoes_impossiveis_sao_rejeitadas():
+    with pytest.raises(ValueError):
+        otimizar_apoios(modelo([[0, -1000, 0]], [[5.0, 0, 0]]), espacamento=(11.0, 12.0))
@@ -0,0 +1,88 @@
+# 7J - Software Educacional Economizador de Tempo do Jonathan v0
+# Testes da varredura paralela
+# Copyright (C) 2024 JMS.
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# LICENÇA: GPL-3.0-or-later
+
+import threading
+
+import numpy as np
+import pytest
+
+from estatica import ShaftModel
+from paralelo import SweepSpec, executar_varredura
+
+
+def spec(n=12):
+    rng = np.random.default_rng(0)
+    casos = []
+    for _ in range(n):
+        k = int(rng.integers(1, 4))
+        f = np.column_stack((np.zeros(k), rng.uniform(-1000, 1000, k), rng.uniform(-1000, 1000, k)))
+        r = np.column_stack((rng.uniform(0, 10, k), rng.uniform(0, 0.2, k), np.zeros(k)))
+        casos.append(ShaftModel(10.0, (0.5, 9.5), f, r))
+    return SweepSpec(casos, [0.03, 0.05], [(690e6, 580e6, 300e6), (440e6, 370e6, 190e6)], n=50)
+
+
+@pytest.fixture(scope="module")
+def serial():
+    return executar_varredura(spec(), processos=1).cs
+
+
+def test_paralelo_igual_ao_serial(serial):
+    resultado = executar_varredura(spec(), processos=2, tamanho_tarefa=3)
+    assert resultado.concluido.all() and not resultado.cancelado
+    assert np.array_equal(resultado.cs, serial)
+
+
+def test_saida_em_arquivo(serial, tmp_path):
+    arquivo = tmp_path / "cs.dat"
+    resultado = executar_varredura(spec(), processos=2, arquivo=str(arquivo))
+    assert np.array_equal(resultado.cs, serial)
+    assert np.array_equal(np.memmap(arquivo, dtype=float, mode="r", shape=serial.shape), serial)
+
+
+@pytest.mark.parametrize("processos", [1, 2])
+def test_progresso_chega_ao_total(processos):
+    chamadas = []
+    executar_varredura(
+        spec(), processos=processos, tamanho_tarefa=4,
+        progresso=lambda feitos, total: chamadas.append((feitos, total)),
+    )
+    feitos = [feito for feito, _ in chamadas]
+    assert feitos == sorted(feitos)
+    assert chamadas[-1] == (12, 12)
+
+
+def test_cancelamento_entre_tarefas(serial):
+    # Cancelado depois da primeira tarefa: o resto fica NaN e não conta como concluído
+    cancelar = threading.Event()
+    resultado = executar_varredura(
+        spec(), processos=1, tamanho_tarefa=5,
+        progresso=lambda feitos, total: cancelar.set(), cancelar=cancelar,
+    )
+    assert resultado.cancelado
+    assert np.count_nonzero(resultado.concluido) == 5
+    assert np.array_equal(resultado.cs[:5], serial[:5])
+    assert np.isnan(resultado.cs[5:]).all()
+
+
+def test_cancelado_antes_de_comecar():
+    cancelar = threading.Event()
+    cancelar.set()
+    resultado = executar_varredura(spec(), processos=2, tamanho_tarefa=1, cancelar=cancelar)
+    assert resultado.cancelado
+    assert np.isnan(resultado.cs[~resultado.concluido]).all()